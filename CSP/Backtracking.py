@@ -1,7 +1,19 @@
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import numpy as np
 from copy import copy
 import matplotlib.pyplot as plt
+import heapq
+from collections import deque
+from .ConstraintIndex import ConstraintIndex
+from .NogoodStore import NogoodStore
+
+# The names of the propagation modes of `Backtracking.solve()`
+PROPAGATIONS = {'none': None, 'bt': None, 'fc': 'fc', 'forward checking': 'fc', 'mac': 'ac3', 'ac3': 'ac3',
+                'ac-3': 'ac3', 'ac2001': 'ac2001', 'ac-2001': 'ac2001'}
+
+# The names of the variable and value orderings of `Backtracking.solve()`
+VARIABLE_ORDERINGS = {'lex': None, 'mrv': 'mrv', 'dom/wdeg': 'domwdeg', 'domwdeg': 'domwdeg'}
+VALUE_ORDERINGS = {'lex': None, 'lcv': 'lcv'}
 
 
 class Variable:
@@ -55,14 +67,97 @@ class Backtracking:
         constraints:
             the constraints of the problem, in the form of (x1, value, x2, value), each constraint
             is a forbidden assignment
+
+        index:
+            the constraints compiled for fast compatibility checks
+
+        nodes:
+            number of assignments made by the last solve
+
+        nogoods:
+            the nogood store of the last solve, None if it did not record nogoods
+
+        domains:
+            list with the current domain of each variable as a bitmask, in `search()`
+
+        values:
+            list with the value of each variable, None for the unassigned variables, in `search()`
+
+        trail:
+            list of (variable, domain) entries, the domains before their changes, undone on backtrack
+
+        support_trail:
+            list of (variable, value, neighbour, support) entries, the last supports of AC-2001 before their
+            changes, undone on backtrack
+
+        weights:
+            list where `weights[x]` is a dict {neighbour: weight of the constraint}, in dom/wdeg searches. the
+            weights start at 1 and are increased by the domain wipeouts
     """
     def __init__(self, n_variables, n_domain, constraints):
 
         self.n_variables: int = n_variables
         self.n_domain: int = n_domain
         self.constraints: set = constraints
+        self.index: ConstraintIndex = ConstraintIndex(n_variables, n_domain, constraints)
+        self.nodes: int = 0
+        self.nogoods: Optional[NogoodStore] = None
+
+        self.domains: List[int] = []
+        self.values: List[int] = []
+        self.trail: List[Tuple[int, int]] = []
+        self.support_trail: List[Tuple[int, int, int, int]] = []
+        self._last_supports: List[List[List[int]]] = []
+        self._explanations: List[List[int]] = []
+        self._explain: bool = False
+
+        self.weights: List[Dict[int, int]] = []
+        self._variable_ordering: Optional[str] = None
+        self._weighted_degrees: List[int] = []
+        self._heap: Optional[List[tuple]] = None
+
+    def solve(self, propagation=None, backjumping=False, nogoods=0, variable_ordering=None, value_ordering=None):
+        """
+        Solve the problem
+        :param propagation: the propagation after each assignment - None for plain backtracking, 'FC' for
+                            forward checking, 'MAC' for maintaining arc consistency with AC-3 or 'AC2001' for
+                            maintaining arc consistency with AC-2001
+        :param backjumping: bool, if True jump back from a dead end to the deepest variable in its conflict set
+                            (conflict-directed backjumping), instead of to the previous variable
+        :param nogoods: int, maximal number of nogoods to record, 0 for no nogood recording
+        :param variable_ordering: the order of the variables - None for 1..n, 'MRV' for the smallest current
+                                  domain first (ties broken by the largest degree) or 'dom/wdeg' for the smallest
+                                  ratio of the current domain to the weighted degree first. Without propagation
+                                  the current domains are still filtered by the assigned neighbours for the ordering
+        :param value_ordering: the order of the values - None for ascending, or 'LCV' for the least constraining
+                               value first
+        :return: dict with the variables, {id: Variable}, or None if there is no solution
+        """
+
+        if (propagation is not None) and (str(propagation).lower() not in PROPAGATIONS):
+            raise NotImplementedError('Not implemented propagation')
 
-    def solve(self):
+        if (variable_ordering is not None) and (str(variable_ordering).lower() not in VARIABLE_ORDERINGS):
+            raise NotImplementedError('Not implemented variable ordering')
+
+        if (value_ordering is not None) and (str(value_ordering).lower() not in VALUE_ORDERINGS):
+            raise NotImplementedError('Not implemented value ordering')
+
+        propagation = PROPAGATIONS[str(propagation).lower()] if propagation is not None else None
+        variable_ordering = (VARIABLE_ORDERINGS[str(variable_ordering).lower()] if variable_ordering is not None
+                             else None)
+        value_ordering = VALUE_ORDERINGS[str(value_ordering).lower()] if value_ordering is not None else None
+        self.nodes = 0
+        self.nogoods = NogoodStore(nogoods) if nogoods > 0 else None
+
+        if (propagation is not None) or backjumping or (self.nogoods is not None) or \
+                (variable_ordering is not None) or (value_ordering is not None):
+
+            print('Start solving CSP using {} algorithm{}...\n'.format(
+                'CBJ' if backjumping else 'BT',
+                ' with {} propagation'.format(propagation.upper()) if propagation is not None else ''))
+
+            return self.search(propagation, backjumping, variable_ordering, value_ordering)
 
         print('Start solving CSP using BT algorithm...\n')
 
@@ -70,74 +165,610 @@ class Backtracking:
         domain = list(range(self.n_domain))
         solution = {i: Variable(i, domain, None) for i in range(1, self.n_variables + 1)}
 
-        # Make assignment for all variables recursively
+        # Make assignment for all variables
         solution = self.assign_variables(1, solution)
 
         return solution
 
     def assign_variables(self, variable, solution: Dict[int, Variable]):
+        """
+        Assign values to the variables from `variable` to the last one by chronological backtracking.
+        The search is iterative, the position in the search tree is the current variable and the current
+        domains of the variables (the values which were not tried yet), so the memory is linear in the number
+        of variables and not in the number of steps.
+        :param variable: the id of the first variable to assign
+        :param solution: dict with the variables, {id: Variable}
+        :return: the solution, or None if there is no solution
+        """
+
+        while variable <= self.n_variables:
+
+            # Backtracked past the first variable - there is no solution
+            if variable < 1:
+
+                return None
+
+            # Look for legal value for the current variable
+            value = self.find_legal_value(variable, solution)
+
+            if value is None:
+
+                solution[variable].reset_domain()
+                variable -= 1
 
-        # If we need to assign value for variable we don't have -
-        # we can return the solution
-        if variable > self.n_variables:
+            else:
 
-            return solution
+                solution[variable].value = value
+                self.nodes += 1
+                variable += 1
 
-        # If we need to assign value for variable 1 and his domain his empty -
-        # there is no solution so return `None`
-        if (variable == 1) & (len(solution[variable].current_domain) == 0):
+        return solution
+
+    def find_legal_value(self, variable: int, solution: Dict[int, Variable]):
+        """
+        Find the first value in the current domain of a variable which is allowed together with the values
+        of the earlier variables, and remove the tried values from the current domain
+        :param variable: the id of the variable
+        :param solution: dict with the variables, {id: Variable}
+        :return: the value, or None if there is no legal value
+        """
+
+        supports = self.index.supports
+
+        # Filter the whole domain by each constraint with an earlier variable
+        allowed = self.index.full_domain
+        for other_variable in self.index.neighbours[variable]:
+
+            if other_variable >= variable:
+                break
+
+            allowed &= supports[other_variable][solution[other_variable].value][variable]
+
+        current_domain = solution[variable].current_domain
+
+        for i, value in enumerate(current_domain):
+
+            if (allowed >> value) & 1:
+
+                solution[variable].current_domain = current_domain[i + 1:]
+                return value
+
+        return None
+
+    def search(self, propagation, backjumping=False, variable_ordering=None, value_ordering=None):
+        """
+        Assign values to all the variables by backtracking, optionally with propagation, conflict-directed
+        backjumping, nogood recording and dynamic variable and value orderings.
+        The current domains are bitmasks which are reduced in place. Every change is recorded on the trail (as
+        are the last supports of AC-2001) and undone when the search backtracks, so nothing is copied.
+        The search is iterative, with a frame for each assigned variable: the variable, its values which were
+        not tried yet, the lengths of the trails before its assignment, its conflict set and the order of its
+        values.
+        A conflict set is a bitmask of the depths of the assignments which are responsible for removing values
+        of the variable. With backjumping or nogoods the search explains every removed value by such a bitmask.
+        The conflict set of a variable gathers the explanations of the values which were removed before its
+        frame was opened and of the values which failed. At a dead end the conflict set is a nogood, the search
+        jumps to its deepest assignment, whose value is then refuted by the rest of the conflict set.
+        The dynamic variable orderings keep the unassigned variables in a heap, see `select_variable()`.
+        :param propagation: None, 'fc', 'ac3' or 'ac2001'
+        :param backjumping: bool, if True use conflict-directed backjumping
+        :param variable_ordering: None, 'mrv' or 'domwdeg'
+        :param value_ordering: None or 'lcv'
+        :return: dict with the variables, {id: Variable}, or None if there is no solution
+        """
+
+        n_variables = self.n_variables
+        full_domain = self.index.full_domain
+        supports = self.index.supports
+        nogoods = self.nogoods
+
+        self.domains = [full_domain] * (n_variables + 1)
+        self.values = [None] * (n_variables + 1)
+        self.trail = []
+        self.support_trail = []
+        self._last_supports = [[[-1] * (n_variables + 1) for _ in range(self.n_domain)]
+                               for _ in range(n_variables + 1)]
+        self._explanations = [[0] * self.n_domain for _ in range(n_variables + 1)]
+        self._explain = backjumping or (nogoods is not None)
+
+        # All the constraints start with weight 1 (dom/wdeg)
+        self.weights = [{neighbour: 1 for neighbour in neighbours} for neighbours in self.index.neighbours]
+        self._weighted_degrees = [len(neighbours) for neighbours in self.index.neighbours]
+        self._variable_ordering = None
+        self._heap = None
+
+        # Make the problem arc consistent before the first assignment
+        if (propagation in ['ac3', 'ac2001']) and (self.propagate(range(1, n_variables + 1), propagation) is not None):
 
             return None
 
-        # Else - look for legal value for the current variable
-        value = self.find_legal_value(variable, solution)
+        self._variable_ordering = variable_ordering
 
-        if value is None:
+        if variable_ordering is not None:
+            self._heap = [self.priority(variable) for variable in range(1, n_variables + 1)]
+            heapq.heapify(self._heap)
 
-            solution[variable].reset_domain()
+        domains, values, explanations = self.domains, self.values, self._explanations
+        neighbours = self.index.neighbours
+        depths = [-1] * (n_variables + 1)
+        frames = []
+        depth = 0
 
-            return self.assign_variables(variable - 1, solution)
+        while depth < n_variables:
 
-        else:
+            # Open a frame for the next variable
+            if len(frames) == depth:
 
-            solution[variable].value = value
-            return self.assign_variables(variable + 1, solution)
+                variable = depth + 1 if variable_ordering is None else self.select_variable()
+                depths[variable] = depth
+                remaining = domains[variable] if propagation is not None else full_domain
+                conflict = 0
 
-    def find_legal_value(self, variable: int, solution: Dict[int, Variable]):
+                if propagation is None:
 
-        variable_domain = copy(solution[variable].current_domain)
+                    # Filter the domain by the assigned neighbours, the first assignment which removes a value
+                    # is its explanation (the current domain is filtered too, but only for the variable ordering)
+                    for other_depth in range(depth):
 
-        for value in solution[variable].current_domain:
+                        other = frames[other_depth][0]
+                        allowed = supports[other][values[other]].get(variable)
 
-            legal = True
+                        if (allowed is not None) and (remaining & ~allowed):
 
-            for other_variable in range(1, variable):
+                            remaining &= allowed
+                            conflict |= 1 << other_depth
 
-                # Check if constraint like this exist
-                constraint = [(variable, value, other_variable, solution[other_variable].value),
-                              (other_variable, solution[other_variable].value, variable, value)]
+                            if (remaining == 0) and (variable_ordering == 'domwdeg'):
+                                self.increase_weight(variable, other)
 
-                if any(c in self.constraints for c in constraint):
+                elif self._explain:
 
-                    legal = False
-                    break
+                    removed = full_domain & ~remaining
+                    while removed:
 
-            # Remove
-            variable_domain.remove(value)
+                        bit = removed & -removed
+                        removed ^= bit
+                        conflict |= explanations[variable][bit.bit_length() - 1]
 
-            if legal:
+                # Order the values by the number of values they remove from the unassigned neighbours
+                value_order = None
+                if value_ordering == 'lcv':
 
-                solution[variable].current_domain = copy(variable_domain)
-                return value
+                    removals = []
+                    unordered = remaining
+                    while unordered:
+
+                        bit = unordered & -unordered
+                        unordered ^= bit
+                        value = bit.bit_length() - 1
+
+                        value_supports = supports[variable][value]
+                        removals.append((sum((domains[neighbour] & ~value_supports[neighbour]).bit_count()
+                                             for neighbour in neighbours[variable] if values[neighbour] is None),
+                                         value))
+
+                    value_order = [value for _, value in sorted(removals)]
+
+                frames.append([variable, remaining, len(self.trail), len(self.support_trail), conflict, value_order])
+
+            frame = frames[-1]
+            variable, remaining, mark, support_mark, conflict, value_order = frame
+
+            # Undo the propagation of the previous value
+            self.undo(mark, support_mark)
+
+            # No value is left - the conflict set is a nogood, jump back to its deepest assignment
+            if remaining == 0:
+
+                if (nogoods is not None) and (conflict != 0):
+
+                    nogoods.add(tuple((frames[other_depth][0], values[frames[other_depth][0]])
+                                      for other_depth in range(depth) if (conflict >> other_depth) & 1))
+
+                # An empty conflict set proves that there is no solution
+                if backjumping or (self._explain and (conflict == 0)):
+                    jump_depth = conflict.bit_length() - 1
+
+                else:
+                    jump_depth = depth - 1
+
+                if jump_depth < 0:
+
+                    return None
+
+                # The variable of the dead end is not assigned
+                frames.pop()
+
+                while len(frames) > jump_depth + 1:
+
+                    self.unassign(frames.pop()[0])
+
+                depth = jump_depth
+                frame = frames[-1]
+                self.unassign(frame[0])
+                frame[4] |= conflict & ~(1 << jump_depth)
+                continue
+
+            # Assign the first untried value
+            if value_order is None:
+                value = (remaining & -remaining).bit_length() - 1
+
+            else:
+                value = next(value for value in value_order if (remaining >> value) & 1)
+
+            frame[1] = remaining ^ (1 << value)
+            self.nodes += 1
+
+            # Refute the value if it completes a nogood
+            if nogoods is not None:
+
+                nogood = nogoods.find(variable, value, values)
+
+                if nogood is not None:
+
+                    for other, _ in nogood[:-1]:
+                        frame[4] |= 1 << depths[other]
+
+                    continue
+
+            wiped_out = self.assign(variable, value, depth, propagation)
+
+            if wiped_out is None:
+
+                depth += 1
+
+            else:
+
+                self.unassign(variable)
+
+                # The value failed for the reasons which removed the values of the wiped out variable
+                if self._explain:
+
+                    for explanation in explanations[wiped_out]:
+                        frame[4] |= explanation
+
+                    frame[4] &= ~(1 << depth)
+
+        domain = list(range(self.n_domain))
+
+        return {i: Variable(i, domain, values[i]) for i in range(1, n_variables + 1)}
+
+    def assign(self, variable: int, value: int, depth: int, propagation) -> Optional[int]:
+        """
+        Assign a value to a variable and propagate it
+        :param variable: the id of the variable
+        :param value: the value
+        :param depth: the depth of the assignment in the search
+        :param propagation: None, 'fc', 'ac3' or 'ac2001'
+        :return: a variable which its domain was wiped out, or None
+        """
+
+        domains, trail, explanations = self.domains, self.trail, self._explanations
+
+        self.values[variable] = value
+
+        if self._variable_ordering == 'domwdeg':
+            self.update_degrees(variable, -1)
+
+        # Without propagation the domains are filtered only for the variable ordering, see below
+        if propagation is None:
+
+            if self._heap is not None:
+                self.forward_check(variable, value, depth, False)
+
+            return None
+
+        removed = domains[variable] & ~(1 << value)
+
+        if removed:
+
+            trail.append((variable, domains[variable]))
+            domains[variable] = 1 << value
+
+            # The other values are removed by this assignment
+            if self._explain:
+
+                while removed:
+
+                    bit = removed & -removed
+                    removed ^= bit
+                    explanations[variable][bit.bit_length() - 1] = 1 << depth
+
+        if propagation != 'fc':
+
+            return self.propagate((variable,), propagation)
+
+        return self.forward_check(variable, value, depth, True)
+
+    def forward_check(self, variable: int, value: int, depth: int, detect: bool) -> Optional[int]:
+        """
+        Filter the domains of the unassigned neighbours of an assigned variable
+        :param variable: the id of the variable
+        :param value: its value
+        :param depth: the depth of the assignment in the search
+        :param detect: bool, if to explain the removed values and stop at a wiped out domain. Otherwise (without
+                       propagation) the domains are filtered only for the variable ordering, and a wiped out
+                       domain is kept empty until its variable is selected
+        :return: a variable which its domain was wiped out, or None
+        """
+
+        domains, trail, explanations = self.domains, self.trail, self._explanations
+        supports = self.index.supports[variable][value]
+
+        for neighbour in self.index.neighbours[variable]:
+
+            if self.values[neighbour] is not None:
+                continue
+
+            domain = domains[neighbour]
+            reduced = domain & supports[neighbour]
+
+            if reduced == domain:
+                continue
+
+            if detect and self._explain:
+
+                removed = domain ^ reduced
+                while removed:
+
+                    bit = removed & -removed
+                    removed ^= bit
+                    explanations[neighbour][bit.bit_length() - 1] = 1 << depth
+
+            if detect and (reduced == 0):
+
+                if self._variable_ordering == 'domwdeg':
+                    self.increase_weight(variable, neighbour)
+
+                return neighbour
+
+            trail.append((neighbour, domain))
+            domains[neighbour] = reduced
+
+            if self._heap is not None:
+                self.push(neighbour)
+
+        return None
+
+    def propagate(self, changed, propagation) -> Optional[int]:
+        """
+        Make the unassigned variables arc consistent, with AC-3 or AC-2001.
+        The queue holds the variables which their domain changed, the unassigned neighbours of a variable from
+        the queue are revised against it: a value is removed if it has no support in the variable's domain,
+        and is explained by the explanations of its (removed) supports.
+        AC-3 looks for a support with a single AND, AC-2001 first checks the last support it found, and else
+        looks for the next support after it.
+        :param changed: the variables which their domain changed
+        :param propagation: 'ac3' or 'ac2001'
+        :return: a variable which its domain was wiped out, or None
+        """
+
+        domains, values, trail, explanations = self.domains, self.values, self.trail, self._explanations
+        supports, neighbours = self.index.supports, self.index.neighbours
+        ac2001 = propagation == 'ac2001'
+
+        queue = deque(changed)
+        queued = set(changed)
+
+        while len(queue) > 0:
+
+            other = queue.popleft()
+            queued.discard(other)
+            other_domain = domains[other]
+
+            for variable in neighbours[other]:
+
+                if values[variable] is not None:
+                    continue
+
+                domain = domains[variable]
+                removed = 0
+
+                unchecked = domain
+                while unchecked:
+
+                    bit = unchecked & -unchecked
+                    unchecked ^= bit
+                    value = bit.bit_length() - 1
+
+                    if not ac2001:
+
+                        if not supports[variable][value][other] & other_domain:
+                            removed |= bit
+
+                        continue
+
+                    last_supports = self._last_supports[variable][value]
+                    last_support = last_supports[other]
+
+                    if (last_support >= 0) and (other_domain >> last_support) & 1:
+                        continue
+
+                    # Look for the next support after the last one
+                    candidates = supports[variable][value][other] & other_domain & (-1 << (last_support + 1))
+
+                    if candidates:
+
+                        self.support_trail.append((variable, value, other, last_support))
+                        last_supports[other] = (candidates & -candidates).bit_length() - 1
+
+                    else:
+
+                        removed |= bit
+
+                if removed:
+
+                    if self._explain:
+
+                        unexplained = removed
+                        while unexplained:
+
+                            bit = unexplained & -unexplained
+                            unexplained ^= bit
+                            value = bit.bit_length() - 1
+
+                            explanation = 0
+                            value_supports = supports[variable][value][other]
+                            while value_supports:
+
+                                support = value_supports & -value_supports
+                                value_supports ^= support
+                                explanation |= explanations[other][support.bit_length() - 1]
+
+                            explanations[variable][value] = explanation
+
+                    if removed == domain:
+
+                        if self._variable_ordering == 'domwdeg':
+                            self.increase_weight(variable, other)
+
+                        return variable
+
+                    trail.append((variable, domain))
+                    domains[variable] = domain ^ removed
+
+                    if self._heap is not None:
+                        self.push(variable)
+
+                    if variable not in queued:
+
+                        queue.append(variable)
+                        queued.add(variable)
 
         return None
 
+    def undo(self, mark: int, support_mark: int):
+        """
+        Undo the changes of the domains and of the last supports back to the given trail lengths
+        :param mark: length of the trail
+        :param support_mark: length of the support trail
+        :return:
+        """
+
+        domains, trail = self.domains, self.trail
+
+        while len(trail) > mark:
+
+            variable, domain = trail.pop()
+            domains[variable] = domain
+
+            if (self._heap is not None) and (self.values[variable] is None):
+                self.push(variable)
+
+        support_trail = self.support_trail
+
+        while len(support_trail) > support_mark:
+
+            variable, value, other, last_support = support_trail.pop()
+            self._last_supports[variable][value][other] = last_support
 
+    def unassign(self, variable: int):
+        """
+        Remove the value of a variable
+        :param variable: the id of the variable
+        :return:
+        """
+
+        self.values[variable] = None
 
+        if self._variable_ordering == 'domwdeg':
+            self.update_degrees(variable, 1)
 
+        if self._heap is not None:
+            self.push(variable)
+
+    def priority(self, variable: int) -> tuple:
+        """
+        The priority of a variable in the variable ordering, the variable with the smallest priority is the next
+        to be assigned
+        :param variable: the id of the variable
+        :return: tuple (domain size, -degree, variable) for MRV, or (domain size / weighted degree, variable)
+                 for dom/wdeg
+        """
 
+        size = self.domains[variable].bit_count()
+
+        if self._variable_ordering == 'mrv':
+            return size, -len(self.index.neighbours[variable]), variable
+
+        weighted_degree = self._weighted_degrees[variable]
+
+        return (size / weighted_degree if weighted_degree > 0 else float('inf')), variable
+
+    def push(self, variable: int):
+        """
+        Push the current priority of an unassigned variable to the heap
+        :param variable: the id of the variable
+        :return:
+        """
+
+        heapq.heappush(self._heap, self.priority(variable))
+
+    def select_variable(self) -> int:
+        """
+        Select the next variable to assign, the unassigned variable with the smallest priority.
+        The heap is updated lazily: the priority of a variable is pushed whenever it changes (its domain, or its
+        weighted degree when a neighbour is assigned or unassigned or a weight is increased), and the outdated
+        entries are dropped when they reach the top. Every unassigned variable has an up-to-date entry, so no
+        variable is rescanned.
+        :return: the id of the variable
+        """
+
+        heap, values = self._heap, self.values
+
+        # Rebuild the heap when it is mostly outdated entries
+        if len(heap) > 8 * (self.n_variables + 8):
+
+            heap[:] = [self.priority(variable) for variable in range(1, self.n_variables + 1)
+                       if values[variable] is None]
+            heapq.heapify(heap)
+
+        while True:
+
+            entry = heap[0]
+            variable = entry[-1]
+
+            # The entry is kept, it is outdated once the variable is assigned
+            if (values[variable] is None) and (entry == self.priority(variable)):
+
+                return variable
+
+            heapq.heappop(heap)
+
+    def update_degrees(self, variable: int, sign: int):
+        """
+        Update the weighted degrees of the neighbours of a variable which was assigned or unassigned (dom/wdeg).
+        The weighted degree of a variable is the sum of the weights of its constraints with unassigned neighbours
+        :param variable: the id of the variable
+        :param sign: -1 if the variable was assigned, 1 if it was unassigned
+        :return:
+        """
+
+        weighted_degrees, values, heap = self._weighted_degrees, self.values, self._heap
+
+        for neighbour, weight in self.weights[variable].items():
+
+            weighted_degrees[neighbour] += sign * weight
+
+            if values[neighbour] is None:
+                heapq.heappush(heap, self.priority(neighbour))
+
+    def increase_weight(self, variable: int, other: int):
+        """
+        Increase the weight of a constraint which wiped out a domain (dom/wdeg)
+        :param variable: the id of a variable of the constraint
+        :param other: the id of the other variable of the constraint
+        :return:
+        """
 
+        self.weights[variable][other] += 1
+        self.weights[other][variable] += 1
 
+        for first, second in [(variable, other), (other, variable)]:
 
+            if self.values[second] is None:
 
+                self._weighted_degrees[first] += 1
 
+                if self.values[first] is None:
+                    self.push(first)
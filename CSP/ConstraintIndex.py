@@ -0,0 +1,75 @@
+import numpy as np
+from typing import Dict, List, Tuple
+
+
+class ConstraintIndex:
+    """
+    Compiled form of the constraints of a binary CSP, built once from the forbidden assignments.
+    A domain (or any set of values of a variable) is kept as an int bitmask, where bit `v` is set if the
+    value `v` is in the set, so a consistency check is a bit test and a whole domain is filtered by a
+    constraint with one AND.
+    The variables are 1..n_variables as in `Backtracking`, so the lists are indexed by the variable id and
+    their first item is not used. Constraints on other variables are ignored.
+
+    Attributes:
+
+        n_variables:
+            number of variables in the problem
+
+        n_domain:
+            number of element in the domain for each variable in the problem
+
+        full_domain:
+            bitmask of the whole domain
+
+        neighbours:
+            list where `neighbours[x]` is the sorted tuple of the variables which share a constraint with x
+
+        compatible:
+            list where `compatible[x]` is a dict {neighbour: bool ndarray with shape (n_domain, n_domain)},
+            where item [v, w] is True if x = v and neighbour = w are allowed together
+
+        supports:
+            list where `supports[x][v]` is a dict {neighbour: bitmask of the neighbour's values which are
+            allowed together with x = v}
+    """
+
+    def __init__(self, n_variables, n_domain, constraints):
+
+        self.n_variables: int = n_variables
+        self.n_domain: int = n_domain
+        self.full_domain: int = (1 << n_domain) - 1
+
+        self.compatible: List[Dict[int, np.ndarray]] = [dict() for _ in range(n_variables + 1)]
+
+        # Drop the constraints which are not on two different variables of the problem
+        forbidden = np.array(list(constraints), dtype=np.int64).reshape((-1, 4))
+        forbidden = forbidden[(forbidden[:, 0] != forbidden[:, 2]) &
+                              np.all((forbidden[:, [0, 2]] >= 1) & (forbidden[:, [0, 2]] <= n_variables), axis=1) &
+                              np.all((forbidden[:, [1, 3]] >= 0) & (forbidden[:, [1, 3]] < n_domain), axis=1)]
+
+        # Orient each constraint from the smaller variable to the larger one
+        swap = forbidden[:, 0] > forbidden[:, 2]
+        forbidden[swap] = forbidden[swap][:, [2, 3, 0, 1]]
+
+        # Group the constraints by their pair of variables
+        pairs, pair_indices, counts = np.unique(forbidden[:, [0, 2]], axis=0, return_inverse=True, return_counts=True)
+        groups = np.split(forbidden[np.argsort(pair_indices.reshape(-1), kind='stable')], np.cumsum(counts)[:-1])
+
+        for (x, y), pair_forbidden in zip(pairs.tolist(), groups):
+
+            matrix = np.ones((n_domain, n_domain), dtype=bool)
+            matrix[pair_forbidden[:, 1], pair_forbidden[:, 3]] = False
+
+            self.compatible[x][y] = matrix
+            self.compatible[y][x] = matrix.T
+
+        self.neighbours: List[Tuple[int, ...]] = [tuple(sorted(neighbours)) for neighbours in self.compatible]
+
+        # Bitmasks of the rows of the matrices
+        weights = np.array([1 << value for value in range(n_domain)], dtype=object)
+        self.supports: List[List[Dict[int, int]]] = [
+            [{neighbour: int(matrix[value].dot(weights)) for neighbour, matrix in neighbours.items()}
+             for value in range(n_domain)]
+            for neighbours in self.compatible
+        ]
@@ -0,0 +1,105 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+# A nogood is a tuple of (variable, value) assignments which can't be extended to a solution together
+Nogood = Tuple[Tuple[int, int], ...]
+
+
+class NogoodStore:
+    """
+    Bounded store of the nogoods learned by `Backtracking.search()`.
+    Each nogood is watched by its last assignment, which is the deepest one in the search when the nogood is
+    learned, so the nogoods which an assignment may complete are found without scanning the store. With a fixed
+    variable order the last assignment of a nogood is always made after the others, so no nogood is missed.
+    When the store is full the least recently used nogood is evicted.
+
+    Attributes:
+
+        capacity:
+            maximal number of nogoods in the store
+
+        hits:
+            number of assignments which were refuted by a nogood
+
+        evictions:
+            number of nogoods which were evicted
+    """
+
+    def __init__(self, capacity=10000):
+
+        self.capacity: int = capacity
+        self.hits: int = 0
+        self.evictions: int = 0
+
+        self._nogoods: OrderedDict = OrderedDict()
+        self._watches: Dict[Tuple[int, int], Set[Nogood]] = dict()
+
+    def add(self, nogood: Nogood):
+        """
+        Add a nogood, evicting the least recently used nogoods if the store is full
+        :param nogood: tuple of (variable, value) assignments, in the order of the search
+        :return:
+        """
+
+        if (self.capacity <= 0) or (nogood in self._nogoods):
+            return
+
+        self._nogoods[nogood] = None
+        self._watches.setdefault(nogood[-1], set()).add(nogood)
+
+        while len(self._nogoods) > self.capacity:
+
+            evicted, _ = self._nogoods.popitem(last=False)
+            self.evictions += 1
+
+            watches = self._watches[evicted[-1]]
+            watches.discard(evicted)
+
+            if len(watches) == 0:
+                del self._watches[evicted[-1]]
+
+    def find(self, variable: int, value: int, values: List[Optional[int]]) -> Optional[Nogood]:
+        """
+        Find a nogood which is completed by an assignment
+        :param variable: the id of the variable
+        :param value: the value assigned to the variable
+        :param values: list with the value of each variable, None for the unassigned variables
+        :return: the nogood, or None if the assignment does not complete a nogood
+        """
+
+        for nogood in self._watches.get((variable, value), ()):
+
+            # Check the deepest assignments first, they change most often
+            for i in range(len(nogood) - 2, -1, -1):
+
+                other, other_value = nogood[i]
+
+                if values[other] != other_value:
+                    break
+
+            else:
+
+                self._nogoods.move_to_end(nogood)
+                self.hits += 1
+
+                return nogood
+
+        return None
+
+    def clear(self):
+        """
+        Remove all the nogoods and reset the counters
+        :return:
+        """
+
+        self._nogoods.clear()
+        self._watches.clear()
+        self.hits = self.evictions = 0
+
+    def __len__(self):
+
+        return len(self._nogoods)
+
+    def __str__(self):
+
+        return 'Nogoods: {}, Hits: {}, Evictions: {}'.format(len(self), self.hits, self.evictions)
@@ -0,0 +1,148 @@
+import numpy as np
+from typing import Dict, Tuple
+
+
+class Board:
+    """
+    Geometry of a sliding-tile board and the packed encoding of its states.
+
+    A state is a single python int where cell `i` (row-major) holds its tile in the
+    bits `[i * bits, (i + 1) * bits)`. The blank is tile 0, so sliding a tile into
+    the blank is two shifts and two additions. All the per-cell data the searches need
+    (shifts, neighbours of the blank) is computed once per board size.
+
+    Attributes:
+
+        size:
+            the width (and height) of the board
+
+        n_cells:
+            number of cells on the board
+
+        bits:
+            number of bits used for each cell in the packed state
+
+        mask:
+            mask of a single cell, i.e. `2 ** bits - 1`
+
+        shifts:
+            tuple with the bit shift of each cell
+
+        moves:
+            tuple where `moves[blank]` holds the cells the blank can move to (up, down, left, right)
+    """
+
+    _instances: Dict[int, 'Board'] = dict()
+
+    def __init__(self, size):
+
+        self.size: int = size
+        self.n_cells: int = size * size
+        self.bits: int = max(1, (self.n_cells - 1).bit_length())
+        self.mask: int = (1 << self.bits) - 1
+        self.shifts: Tuple[int, ...] = tuple(cell * self.bits for cell in range(self.n_cells))
+        self.moves: Tuple[Tuple[int, ...], ...] = tuple(self._neighbours(cell) for cell in range(self.n_cells))
+
+    @classmethod
+    def of(cls, size: int) -> 'Board':
+        """
+        Get the board of a given size, boards are immutable so they are created once and shared
+        :param size: the width of the board
+        :return: Board object
+        """
+
+        try:
+            return cls._instances[size]
+
+        except KeyError:
+            board = cls._instances[size] = cls(size)
+            return board
+
+    def _neighbours(self, cell: int) -> Tuple[int, ...]:
+        """
+        Get the cells adjacent to a given cell, in the order up, down, left, right
+        :param cell: index of the cell
+        :return: tuple with the adjacent cells
+        """
+
+        row, col = divmod(cell, self.size)
+        neighbours = []
+
+        if row > 0:
+            neighbours.append(cell - self.size)
+
+        if row < self.size - 1:
+            neighbours.append(cell + self.size)
+
+        if col > 0:
+            neighbours.append(cell - 1)
+
+        if col < self.size - 1:
+            neighbours.append(cell + 1)
+
+        return tuple(neighbours)
+
+    def pack(self, table) -> int:
+        """
+        Pack a table into a single int
+        :param table: the table as ndarray with shape (size, size)
+        :return: packed state
+        """
+
+        state = 0
+
+        for cell, tile in enumerate(np.asarray(table).flatten()):
+            state |= int(tile) << self.shifts[cell]
+
+        return state
+
+    def unpack(self, state: int) -> np.ndarray:
+        """
+        Unpack a packed state into a table
+        :param state: packed state
+        :return: ndarray with shape (size, size)
+        """
+
+        return np.array(self.tiles(state)).reshape((self.size, self.size))
+
+    def tiles(self, state: int) -> list:
+        """
+        Get the tiles of a packed state as a flat list (row-major)
+        :param state: packed state
+        :return: list with the tile of each cell
+        """
+
+        return [(state >> shift) & self.mask for shift in self.shifts]
+
+    def tile(self, state: int, cell: int) -> int:
+        """
+        Get the tile placed in a given cell
+        :param state: packed state
+        :param cell: index of the cell
+        :return: the tile
+        """
+
+        return (state >> self.shifts[cell]) & self.mask
+
+    def blank(self, state: int) -> int:
+        """
+        Find the cell of the blank in a packed state
+        :param state: packed state
+        :return: index of the blank cell
+        """
+
+        return self.tiles(state).index(0)
+
+    def slide(self, state: int, blank: int, cell: int) -> int:
+        """
+        Slide the tile in `cell` into the blank. The blank moves to `cell`.
+        :param state: packed state
+        :param blank: the current cell of the blank
+        :param cell: a cell adjacent to the blank
+        :return: the new packed state
+        """
+
+        shift = self.shifts[cell]
+        tile = (state >> shift) & self.mask
+
+        return state - (tile << shift) + (tile << self.shifts[blank])
@@ -0,0 +1,185 @@
+import numpy as np
+from pathlib import Path
+from typing import Dict, Tuple
+from .Board import Board
+from .heuristics import Heuristic
+from .PatternDatabase import DATABASES_DIRECTORY, MappedTables, save_table
+from .layered_bfs import bfs_layers, tiles_array
+from .ranking import partial_count, partial_rank, partial_rank_array, permutation_parity
+from .Symmetry import Symmetry
+
+# Largest board which its whole state space fits in a table
+MAX_ORACLE_SIZE = 3
+
+# Value of the states which are not reachable from the goal
+UNREACHABLE = 255
+
+
+class DistanceOracle(MappedTables):
+    """
+    Exact distance of every state to the goal, for the boards which their whole state space fits in memory.
+    The distances are computed once by backward (layered) BFS from the goal and saved under the databases
+    directory. A state is indexed by the Lehmer rank of the cells of its tiles, the blank included,
+    except the last two tiles. The cells of the last two tiles are determined by the permutation parity
+    of the reachable states, so the 3x3 table holds 9! / 2 = 181,440 bytes.
+    The object can be passed as h_function to `EightPuzzle.solve()` (the perfect heuristic), and it
+    is the table behind `EightPuzzle.oracle_solve()`.
+
+    Attributes:
+
+        directory:
+            directory of the persisted tables
+    """
+
+    def __init__(self, directory=None):
+
+        self.directory = directory
+        self._compiled: Dict[Tuple[int, int], CompiledDistanceOracle] = dict()
+
+    def compile(self, board: Board, goal_table) -> 'CompiledDistanceOracle':
+        """
+        Load the distances table for a given goal, build and save it first if it doesn't exist.
+        :param board: the board of the puzzle
+        :param goal_table: goal state table, ndarray
+        :return: CompiledDistanceOracle object
+        """
+
+        if board.size > MAX_ORACLE_SIZE:
+            raise NotImplementedError('The distance oracle is available only up to {0}x{0} boards'.format(
+                MAX_ORACLE_SIZE))
+
+        goal = board.pack(goal_table)
+
+        try:
+            return self._compiled[board.size, goal]
+
+        except KeyError:
+            pass
+
+        directory = Path(self.directory if self.directory is not None else DATABASES_DIRECTORY)
+        path = directory / 'oracle_{}_{:x}.npy'.format(board.size, goal)
+
+        if not path.exists():
+            save_table(path, CompiledDistanceOracle.build(board, goal))
+
+        compiled = CompiledDistanceOracle(board, goal_table, np.load(path, mmap_mode='r'))
+        self._compiled[board.size, goal] = compiled
+
+        return compiled
+
+    def __call__(self, table, goal_table):
+
+        board = Board.of(len(table))
+
+        return self.compile(board, goal_table)(board.pack(table))
+
+
+class CompiledDistanceOracle(Heuristic):
+    """
+    Distances table of a specific goal, evaluated on packed states
+    """
+
+    def __init__(self, board, goal_table, table):
+
+        super().__init__(board, goal_table)
+        self.table: np.ndarray = table
+        self.goal_parity: int = self.parity(board.pack(goal_table))
+
+    def parity(self, state: int) -> int:
+        """
+        Every move swap the blank with a tile, so the parity of the permutation (blank included) flip
+        together with the parity of the blank's distance from its goal cell. States with a different
+        parity than the goal are not reachable.
+        :param state: packed state
+        :return: the parity of the state, 0 or 1
+        """
+
+        tiles = self.board.tiles(state)
+        row, col = divmod(tiles.index(0), self.board.size)
+        goal_row, goal_col = divmod(self.goal_cells[0], self.board.size)
+
+        return permutation_parity(tiles) ^ ((abs(row - goal_row) + abs(col - goal_col)) & 1)
+
+    @staticmethod
+    def index(board: Board, state: int) -> int:
+        """
+        Get the index of a state in the table
+        :param board: the board of the puzzle
+        :param state: packed state
+        :return: the Lehmer rank of the cells of the tiles 0, ..., n - 3
+        """
+
+        positions = [0] * board.n_cells
+        for cell, tile in enumerate(board.tiles(state)):
+            positions[tile] = cell
+
+        return partial_rank(positions[:-2], board.n_cells)
+
+    @staticmethod
+    def build(board: Board, goal: int) -> np.ndarray:
+        """
+        Compute the distance of all the states by layered BFS from the goal. When the goal is symmetric
+        the BFS keeps only the canonical states, and each layer is reflected back when it's written.
+        :param board: the board of the puzzle
+        :param goal: the packed goal state
+        :return: uint8 ndarray indexed by `index()`
+        """
+
+        table = np.full(partial_count(board.n_cells, board.n_cells - 2), UNREACHABLE, dtype=np.uint8)
+        symmetry = Symmetry.of(board, goal)
+
+        for distance, layer in enumerate(bfs_layers(board, goal, symmetry=symmetry)):
+
+            if symmetry is not None:
+                layer = np.concatenate([layer, symmetry.reflect_array(layer)])
+
+            # positions[:, tile] is the cell of the tile
+            positions = np.argsort(tiles_array(board, layer), axis=1)
+            table[partial_rank_array(positions[:, :-2], board.n_cells)] = distance
+
+        return table
+
+    def __call__(self, state):
+
+        # The unreachable twin of each reachable state share its index
+        if self.parity(state) != self.goal_parity:
+            return np.inf
+
+        distance = int(self.table[self.index(self.board, state)])
+
+        return np.inf if distance == UNREACHABLE else distance
+
+    def path(self, state: int, blank: int):
+        """
+        Get an optimal path from a state to the goal by greedy descent on the distances
+        :param state: packed state
+        :param blank: the blank cell of the state
+        :return: list of (state, blank) from the state to the goal, or None if the goal is not reachable
+        """
+
+        distance = self(state)
+
+        if distance == np.inf:
+            return None
+
+        path = [(state, blank)]
+
+        while distance > 0:
+
+            for cell in self.board.moves[blank]:
+
+                child = self.board.slide(state, blank, cell)
+
+                # The children of a reachable state are reachable, no need to check their parity
+                if self.table[self.index(self.board, child)] == distance - 1:
+                    state, blank = child, cell
+                    break
+
+            path.append((state, blank))
+            distance -= 1
+
+        return path
+
+
+# Shared oracle, the compiled tables are reused by all the puzzles of the process
+ORACLE = DistanceOracle()
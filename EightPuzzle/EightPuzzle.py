@@ -1,42 +1,300 @@
 import numpy as np
 from .Node import Node
-import random as rnd
+from .NodeStore import NodeStore
+from .SolveEvent import SolveEvent
+from .SearchStats import SearchStats, TimedHeuristic
+from .Board import Board
+from .Symmetry import Symmetry
+from .DistanceOracle import ORACLE
+from .PatternDatabase import MappedTables, prepare_tables
+from .layered_bfs import bfs_layers, contains, count_children, trace_path
+from .hda_star import owner, run_worker
+from .heuristics import compile_heuristic, RelabelledHeuristic
+from .ranking import permutation_parity
+from .sampling import sample_tables
+from time import time
+import multiprocessing as mp
+import os
+import heapq
+from collections import deque
+from queue import Empty, Queue
+from threading import Thread
+from functools import wraps
 import sys
 
+# Number of expansions between two checks of the deadline
+DEADLINE_CHECK_INTERVAL = 1024
+
+# Seconds between two probe waves of HDA*'s termination detection
+PROBE_INTERVAL = 0.05
+
+# The fields of the workers' SearchStats which are summed by HDA*, the times are measured only in profiled searches
+WORKER_STATS_FIELDS = ('expanded', 'generated', 'duplicates', 'pruned', 'peak_frontier', 'bytes', 'heuristic_time',
+                       'frontier_time')
+
+# Bits of the node's handle in the open list entries
+HANDLE_BITS = 40
+HANDLE_MASK = (1 << HANDLE_BITS) - 1
+
+
+def instrumented(solver):
+    """
+    Decorator of the solvers, which collect the statistics of the search in a new SearchStats
+    (`EightPuzzle.stats`) and return it
+    :param solver: solver method
+    :return: the decorated method
+    """
+
+    @wraps(solver)
+    def instrumented_solver(self, *args, **kwargs):
+
+        self.stats = SearchStats(self.profile)
+
+        try:
+            solver(self, *args, **kwargs)
+
+        finally:
+            self.stats.finish()
+
+        return self.stats
+
+    return instrumented_solver
+
 
 class EightPuzzle:
 
     def __init__(self, init_state, goal_state):
 
-        self.init_state = Node(init_state, 0, None)
+        if np.shape(init_state) != np.shape(goal_state) or len(init_state) != len(init_state[0]):
+            raise ValueError('The init state and the goal state must be square tables with the same size')
+
+        self.board = Board.of(len(init_state))
+
+        init_packed = self.board.pack(init_state)
+
+        self.init_state = Node(self.board, init_packed, self.board.blank(init_packed), 0, None)
 
         self.goal_state = goal_state
 
+        self.goal = self.board.pack(goal_state)
+
         self.solution = None
 
-    def solve(self, algorithm, h_function, search_type='dfs', verbose=True):
+        self.deadline = None
+
+        self.bound = None
+
+        # If the last search reached its time limit and returned the best solution found (ARA*)
+        self.timed_out = False
+
+        # The events of a running search, see `solve_iter()`
+        self.listener = None
+
+        self.progress_interval = None
+
+        self.stopped = False
+
+        self.stats = SearchStats()
+
+        self.profile = False
+
+        self.hook = None
+
+        self._started = None
+
+        self._last_progress = None
+
+        # The heuristics' lookup tables are compiled for the goal on their first use, see `heuristic()`
+        self._heuristics = dict()
+
+    def solve(self, algorithm, h_function, search_type='dfs', verbose=True, time_limit=None, weight=2,
+              beam_width=100, cache=None, workers=None, profile=False, hook=None):
         """
         This method get an algorithm name to solve the eight-puzzle, and heuristic function.
-        The method return a solution.
+        The method return a solution. The suboptimality bound of the solution (its cost is at most
+        bound times the optimal cost) is kept in the `bound` attribute, and the statistics of the search
+        in the `stats` attribute. `timed_out` tells if the solution is the best one found until the time limit.
+        :param profile: bool, if to measure the time of the heuristic and of the frontier operations
+        :param hook: function which get the SearchStats, called every DEADLINE_CHECK_INTERVAL expansions
+        :param cache: SolutionCache, optional. A cached puzzle is not searched, and optimal solutions are put
+                        in the cache
+        :param workers: int, number of processes of HDA*, by default the number of CPUs
+        :param beam_width: int, the width of the beam search
+        :param weight: float, the weight of weighted A* and the initial weight of ARA*
+        :param time_limit: float, seconds until the search is stopped with TimeoutError, optional
         :param verbose: bool, if to verbose while running
         :param search_type: str, search type if using B&B. currently need to be DFS/BFS
         :param algorithm: str, algorithm name
         :param h_function: function which get current table (matrix) and goal state (matrix)
-                            and return scalar
+                            and return scalar, not used by the oracle
         :return: solution as Node object or None if there is no solution
         """
 
-        if algorithm.lower() in ['bnb', 'b&b']:
-            self.bnb_solve(h_function, search_type, verbose)
+        self._started = self._last_progress = time()
+        self.deadline = self._started + time_limit if time_limit is not None else None
+        self.bound = 1
+        self.timed_out = False
+        self.stats = SearchStats(profile)
+        self.profile = profile
+        self.hook = hook
 
-        elif algorithm.lower() in ['a*', 'a_star', 'a star']:
-            self.a_star_solve(h_function, verbose)
+        if cache is not None:
 
-        else:
-            raise NotImplementedError('Un-implemented algorithm, please choose different algorithm')
+            moves = cache.get(self.board, self.init_state.state, self.goal)
+
+            if moves is not None:
+                self.solution = self.replay(moves)
+                self.stats.finish()
+                return self.reconstruct_solution(self.solution)
+
+        try:
+
+            # Otherwise the searches would exhaust the half of the states which is reachable from the init state
+            if not self.is_solvable(self.init_state.table, self.goal_state):
+                self.solution = None
+                self.stats.finish()
+                return None
+
+            if algorithm.lower() in ['bnb', 'b&b']:
+                self.bnb_solve(h_function, search_type, verbose)
+
+            elif algorithm.lower() in ['a*', 'a_star', 'a star']:
+                self.a_star_solve(h_function, verbose)
+
+            elif algorithm.lower() in ['wa*', 'weighted a*', 'weighted_a_star']:
+                self.a_star_solve(h_function, verbose, reopen=False, weight=weight)
+
+            elif algorithm.lower() in ['ara*', 'ara_star']:
+                self.ara_star_solve(h_function, verbose, weight)
+
+            elif algorithm.lower() in ['beam', 'beam search']:
+                self.beam_solve(h_function, verbose, beam_width)
+
+            elif algorithm.lower() in ['hda*', 'hda_star']:
+                self.hda_star_solve(h_function, verbose, workers)
+
+            elif algorithm.lower() in ['ida*', 'ida_star', 'ida star']:
+                self.ida_star_solve(h_function, verbose)
+
+            elif algorithm.lower() in ['mm', 'bidirectional']:
+                self.bidirectional_solve(h_function, verbose)
+
+            elif algorithm.lower() == 'oracle':
+                self.oracle_solve(verbose)
+
+            elif algorithm.lower() in ['layered bfs', 'layered_bfs']:
+                self.layered_bfs_solve(verbose)
+
+            else:
+                raise NotImplementedError('Un-implemented algorithm, please choose different algorithm')
+
+        finally:
+            self.deadline = None
+            self.profile = False
+            self.hook = None
+
+        if self.solution is None:
+            return None
+
+        if (cache is not None) and (self.bound == 1):
+            solution = self.reconstruct_solution(self.solution)
+            cache.put(self.board, [node.state for node in solution], [node.blank for node in solution], self.goal)
 
         return self.reconstruct_solution(self.solution)
 
+    def solve_iter(self, algorithm, h_function, search_type='dfs', time_limit=None, weight=2, beam_width=100,
+                   progress_interval=1.0, cache=None):
+        """
+        Anytime variant of `solve()`, which stream the events of the search.
+        An 'improvement' event is yielded each time the search find a better solution (B&B and ARA* improve
+        their solution while running, the other algorithms find a single solution), and a 'progress' event
+        every progress_interval seconds. The last event is 'finished', or 'timeout' with the best solution
+        found before the time limit. Closing the generator stops the search.
+        The search runs in a background thread, the arguments are as in `solve()`.
+        :param progress_interval: float, seconds between two progress events, None for no progress events
+        :return: iterator of SolveEvent
+        """
+
+        events = Queue()
+
+        def run():
+
+            try:
+                solution = self.solve(algorithm, h_function, search_type, False, time_limit, weight, beam_width,
+                                      cache)
+                events.put(('timeout' if self.timed_out else 'finished', solution))
+
+            except TimeoutError:
+                events.put(('timeout', None))
+
+            except BaseException as error:
+                events.put(('error', error))
+
+        self.listener = events.put
+        self.progress_interval = progress_interval
+        self.stopped = False
+
+        thread = Thread(target=run, daemon=True)
+        thread.start()
+
+        best = None
+
+        try:
+
+            while True:
+
+                event = events.get()
+
+                if isinstance(event, SolveEvent):
+
+                    if event.kind == 'improvement':
+                        best = event
+
+                    yield event
+                    continue
+
+                kind, result = event
+                expansions = self.stats.expanded
+                elapsed = time() - self._started
+
+                if kind == 'error':
+                    raise result
+
+                # Solutions which were found without intermediate improvements
+                if (result is not None) and (best is None or len(result) - 1 < best.cost):
+                    best = SolveEvent('improvement', result, self.bound, expansions, elapsed)
+                    yield best
+
+                if best is None:
+                    yield SolveEvent(kind, None, None, expansions, elapsed)
+
+                else:
+                    yield SolveEvent(kind, best.solution, best.bound if kind == 'timeout' else self.bound,
+                                     expansions, elapsed)
+
+                return
+
+        finally:
+            # Stop the search if the generator was closed before the end
+            self.stopped = True
+            thread.join()
+            self.stopped = False
+            self.listener = None
+
+    def report_improvement(self, states, blanks, bound):
+        """
+        Report a better solution to the listener of `solve_iter()`
+        :param states: list with the packed states of the solution
+        :param blanks: list with the blank cell of each state
+        :param bound: the suboptimality bound of the solution
+        :return:
+        """
+
+        if self.listener is not None:
+            solution = self.reconstruct_solution(self.path_to_node(states, blanks))
+            self.listener(SolveEvent('improvement', solution, bound, self.stats.expanded, time() - self._started))
+
+    @instrumented
     def bnb_solve(self, h_function, search_type='dfs', verbose=True, init_ub=np.inf):
         """
         This method implement Branch & Bound algorithm.
@@ -45,91 +303,273 @@ class EightPuzzle:
         :param search_type: str, how to search - DFS or BFS?
         :param verbose: bool, if to print log messages
         :param h_function: heuristic function for the LB
-        :return: solution (Node)
+        :return: SearchStats, the solution (Node) is kept in the `solution` attribute
         """
 
         # Ensure the search type
         if search_type.lower() not in ['bfs', 'dfs']:
             raise NotImplementedError('The search traverse was not implemented yet.')
 
-        # Init params
-        solution = None
-        open_states = [self.init_state]
-        ub = init_ub
-        iterations = 0
+        h = self.heuristic(h_function)
 
         # Verbose
         if verbose:
             print('Running B&B while searching {} approach...\nGot my init state: \n{}'.format(search_type.upper(),
                                                                                                self.init_state))
 
-        # Start searching for solution
-        while len(open_states) > 0:
+        if search_type.lower() == 'dfs':
+            self._bnb_dfs(h, init_ub, verbose)
 
-            # Verbose the status
-            if verbose:
-                iterations += 1
-                if iterations % 300 == 0:
-                    print_status(iterations, len(open_states), ub, parent_depth)
+        else:
+            self._bnb_bfs(h, init_ub, verbose)
 
-            # Get the current parent node for this iteration
-            parent = open_states.pop(0)
-            current_children = []
-            parent_depth = parent.depth()
+    def _bnb_dfs(self, h, ub, verbose):
+        """
+        Depth-First Branch & Bound with an explicit stack.
+        The moves are made and undone on a single path of packed states, the states on the path are
+        kept in a set for the cycle check, and the depth is the length of the path.
+        :param h: compiled heuristic
+        :param ub: the initial UB
+        :param verbose: bool, if to print log messages
+        :return:
+        """
+
+        board = self.board
+        goal = self.goal
+        stats = self.stats
+        best_path = None
+
+        # The current path and its states. stack[0] holds the root, stack[i + 1] holds the children
+        # of path[i] which were not searched yet, sorted by descending LB so the best child is popped first
+        path = []
+        blanks = []
+        on_path = set()
+        init_h = h(self.init_state.state)
+        stack = [[(init_h, self.init_state.state, self.init_state.blank)]]
+        frontier = 1
+
+        def push_frame(children):
+
+            children.sort(key=lambda x: x[0], reverse=True)
+            stack.append(children)
+
+        push_frame, pop_child = stats.timed(push_frame), stats.timed(list.pop)
+
+        if self.init_state.state == goal:
+            stack.clear()
+            best_path = [self.init_state.state], [self.init_state.blank]
+
+        while len(stack) > 0:
+
+            frame = stack[-1]
+
+            # All the children were searched - undo the move
+            if len(frame) == 0:
+                stack.pop()
+                if len(path) > 0:
+                    on_path.discard(path.pop())
+                    blanks.pop()
+                continue
 
-            # Get all the parent's parents to avoid loops
-            all_parents = get_all_parents(parent)
+            h_value, state, blank = pop_child(frame)
+            depth = len(path)
+            frontier -= 1
+
+            # Bound, the children in the frame have a larger LB
+            if depth + h_value >= ub:
+                stats.pruned += len(frame) + 1
+                frontier -= len(frame)
+                frame.clear()
+                continue
+
+            stats.expanded += 1
+            if stats.expanded % DEADLINE_CHECK_INTERVAL == 0:
+                self.check_deadline()
+
+            if verbose and stats.expanded % 300 == 0:
+                print_status(stats.expanded, frontier, ub, depth)
+
+            # Make the move
+            path.append(state)
+            blanks.append(blank)
+            on_path.add(state)
 
             # Branch
-            for child in parent.expand():
+            children = []
+            stats.generated += len(board.moves[blank])
+            for cell in board.moves[blank]:
 
-                # If this children is the goal state
-                if (child == self.goal_state).all():
+                child = board.slide(state, blank, cell)
 
-                    # If this solution is better then the current solution - update UB
-                    if parent_depth + 1 < ub:
-                        ub = parent_depth + 1
-                        solution = Node(child, ub, parent)
+                # If this children is the goal state - update the UB
+                if child == goal:
+
+                    if depth + 1 < ub:
+                        ub = depth + 1
+                        best_path = path + [child], blanks + [cell]
+                        self.report_improvement(*best_path, suboptimality(ub, init_h))
+
+                elif child in on_path:
+                    stats.duplicates += 1
 
-                # Bound
                 else:
-                    if tuple(child.flatten()) not in all_parents:
 
-                        lb = parent_depth + 1 + h_function(child, self.goal_state)
+                    child_h = h.update(h_value, state, blank, cell, child)
+
+                    if depth + 1 + child_h < ub:
+                        children.append((child_h, child, cell))
 
-                        if lb < ub:
-                            current_children.append(Node(child, lb, parent))
+                    else:
+                        stats.pruned += 1
 
-            # Update open list according to the search type
-            current_children.sort(key=lambda x: x.lb)
+            push_frame(children)
+            frontier += len(children)
+            stats.frontier(frontier)
 
-            if search_type.lower() == 'dfs':
-                # Insert current children to the beginning of the list
-                open_states = current_children + open_states
+        if verbose & (best_path is not None):
+            print_finished(stats.expanded)
+
+        stats.estimate_bytes((init_h, self.init_state.state, self.init_state.blank))
+        self.solution = None if best_path is None else self.path_to_node(*best_path)
+
+    def _bnb_bfs(self, h, ub, verbose):
+        """
+        Breadth-First Branch & Bound with a FIFO queue of NodeStore handles. States are visited by
+        non-decreasing depth, so a state which was already reached is pruned. A state and its reflection
+        are reached once, see `reflection()`.
+        :param h: compiled heuristic
+        :param ub: the initial UB
+        :param verbose: bool, if to print log messages
+        :return:
+        """
 
-            elif search_type.lower() == 'bfs':
-                # Insert current children to the end of the list
-                open_states += current_children
+        board = self.board
+        goal = self.goal
+        stats = self.stats
+        best_handle = None
 
-        if verbose & (solution is not None):
-            print_finished(iterations)
+        store = NodeStore(board)
+        init_h = h(self.init_state.state)
+        queue = deque([store.add(self.init_state.state, 0, init_h, -1, self.init_state.blank)])
+        popleft, extend = stats.timed(queue.popleft), stats.timed(queue.extend)
+        reflect, cells = self.reflection()
+        reached = {min(self.init_state.state, reflect(self.init_state.state))}
 
-        self.solution = solution
+        if self.init_state.state == goal:
+            best_handle = queue.popleft()
 
-    def a_star_solve(self, h_function, verbose=True):
+        while len(queue) > 0:
+
+            handle = popleft()
+            state, blank, depth = store.state[handle], store.blank[handle], store.g[handle]
+            h_value = store.f[handle] - depth
+            if h.integral:
+                h_value = int(h_value)
+
+            # Bound, the UB may be improved since the node was queued
+            if depth + h_value >= ub:
+                stats.pruned += 1
+                continue
+
+            stats.expanded += 1
+            if stats.expanded % DEADLINE_CHECK_INTERVAL == 0:
+                self.check_deadline()
+
+            if verbose and stats.expanded % 300 == 0:
+                print_status(stats.expanded, len(queue), ub, depth)
+
+            reflected = reflect(state)
+
+            # Branch, sort the children by their LB
+            children = []
+            stats.generated += len(board.moves[blank])
+            for cell in board.moves[blank]:
+
+                child = board.slide(state, blank, cell)
+
+                # If this children is the goal state - update the UB
+                if child == goal:
+
+                    if depth + 1 < ub:
+                        ub = depth + 1
+                        best_handle = store.add(child, ub, ub, handle, cell)
+                        self.report_improvement(*store.path(best_handle), suboptimality(ub, init_h))
+
+                    continue
+
+                # The reflection of the child is the reflected move in the reflected state
+                key = min(child, board.slide(reflected, cells[blank], cells[cell]))
+
+                if key in reached:
+                    stats.duplicates += 1
+
+                else:
+
+                    reached.add(key)
+                    child_h = h.update(h_value, state, blank, cell, child)
+
+                    if depth + 1 + child_h < ub:
+                        children.append((depth + 1 + child_h, child, cell))
+
+                    else:
+                        stats.pruned += 1
+
+            children.sort(key=lambda x: x[0])
+            extend([store.add(child, depth + 1, lb, handle, cell) for lb, child, cell in children])
+            stats.frontier(len(queue))
+
+        if verbose & (best_handle is not None):
+            print_finished(stats.expanded)
+
+        stats.estimate_bytes(0, len(store) * store.bytes_per_node, reached)
+        self.solution = None if best_handle is None else self.path_to_node(*store.path(best_handle))
+
+    @instrumented
+    def a_star_solve(self, h_function, verbose=True, reopen=True, weight=1):
 
         """
         This method implement A* algorithm.
+        The nodes are kept in a NodeStore and referred by their handles. The open list is a binary heap
+        ordered by (f, h, insertion order), stale entries are skipped when popped (lazy deletion)
+        instead of being removed from the heap.
+        With weight w > 1 this is weighted A*, f = g + w * h, and the solution cost is at most w times
+        the optimal cost (also without reopening). A state and its reflection share their best node, see
+        `reflection()`.
+        :param weight: float, the weight of the heuristic, 1 for (optimal) A*
+        :param reopen: bool, if to reopen closed states which reached with a better g value.
+                        with a consistent heuristic a closed state never gets a better g value.
         :param verbose: bool, if to print log messages
         :param h_function: heuristic function for f function.
-        :return: solution (Node)
+        :return: SearchStats, the solution (Node) is kept in the `solution` attribute
         """
 
         # Init params
-        solution = None
-        open_list = [self.init_state]
-        close_set = set()
-        iterations = 0
+        board = self.board
+        h = self.heuristic(h_function)
+        store = NodeStore(board)
+        init_h = h(self.init_state.state)
+        stats = self.stats
+
+        self.solution = None
+
+        if init_h == np.inf:
+            return
+
+        # Integral weights keep the open list entries as ints
+        integral = h.integral and float(weight).is_integer()
+        if integral:
+            weight = int(weight)
+
+        self.bound = weight
+
+        # The handle of the best node of each state (keyed by the smaller of the state and its reflection),
+        # and if each node was expanded
+        reflect, cells = self.reflection()
+        root = store.add(self.init_state.state, 0, init_h, -1, self.init_state.blank)
+        best = {min(self.init_state.state, reflect(self.init_state.state)): root}
+        expanded = bytearray(1)
+        open_list = [heap_key(integral, weight * init_h, init_h, root)]
+        push, pop = stats.timed(heapq.heappush), stats.timed(heapq.heappop)
 
         # Verbose
         if verbose:
@@ -138,91 +578,941 @@ class EightPuzzle:
 
         while len(open_list) > 0:
 
+            # Get the current parent node for this iteration
+            stats.frontier(len(open_list))
+            handle = heap_handle(pop(open_list))
+            state = store.state[handle]
+            reflected = reflect(state)
+
+            # Skip stale entries, this state was pushed again with a better g value
+            if best[min(state, reflected)] != handle:
+                continue
+
+            stats.expanded += 1
+            if stats.expanded % DEADLINE_CHECK_INTERVAL == 0:
+                self.check_deadline()
+
             # Verbose the status
             if verbose:
-                iterations += 1
-                if iterations % 300 == 0:
-                    print_status(iterations, len(open_list))
-
-            # Get the current parent node for this iteration
-            parent = open_list.pop(0)
-            g_value = parent.depth() + 1
+                if stats.expanded % 300 == 0:
+                    print_status(stats.expanded, len(open_list))
 
             # If this node is the solution - stop
-            if (parent.table == self.goal_state).all():
+            if state == self.goal:
 
-                self.solution = parent
+                self.solution = self.path_to_node(*store.path(handle))
 
                 if verbose:
-                    print_finished(iterations)
+                    print_finished(stats.expanded)
 
-                return
+                break
+
+            expanded[handle] = 1
+            blank = store.blank[handle]
+            g_value = store.g[handle] + 1
+            h_value = store.f[handle] - store.g[handle]
+            if h.integral:
+                h_value = int(h_value)
 
             # Expand node
-            for child in parent.expand():
+            stats.generated += len(board.moves[blank])
+            for cell in board.moves[blank]:
+
+                child = board.slide(state, blank, cell)
+                key = min(child, board.slide(reflected, cells[blank], cells[cell]))
+                previous = best.get(key)
+
+                # Duplicate detection, keep only the best path to each state
+                if previous is not None:
+
+                    if g_value >= store.g[previous] or (expanded[previous] and not reopen):
+                        stats.duplicates += 1
+                        continue
+
+                child_h = h.update(h_value, state, blank, cell, child)
+
+                # Dead end, the goal is not reachable from the child
+                if child_h == np.inf:
+                    stats.pruned += 1
+                    continue
+
+                child_handle = best[key] = store.add(child, g_value, g_value + child_h, handle, cell)
+                expanded.append(0)
+                push(open_list, heap_key(integral, g_value + weight * child_h, child_h, child_handle))
+
+        stats.estimate_bytes(heap_key(integral, weight * init_h, init_h, root), len(store) * store.bytes_per_node,
+                             best, expanded)
+
+    @instrumented
+    def hda_star_solve(self, h_function, verbose=True, workers=None):
+        """
+        This method implement Hash-Distributed A* (HDA*), A* over a pool of processes which each owns
+        the states hashed to it, see the `hda_star` module. This process coordinates the search - it
+        sends the init state to its owner, broadcasts the incumbent, detects the termination and traces
+        the solution back through the owners of its states.
+        The statistics are summed over the workers' SearchStats - the peak frontier and the bytes are the sum
+        of the workers' peaks (an upper bound, the peaks may be at different times), and in profiled searches
+        the times are the workers' CPU times, so they may exceed the run time.
+        :param workers: int, number of processes, by default the number of CPUs
+        :param verbose: bool, if to print log messages
+        :param h_function: heuristic function for f function, must be picklable
+        :return: SearchStats, the solution (Node) is kept in the `solution` attribute
+        """
+
+        workers = workers or os.cpu_count()
+        self.solution = None
+
+        prepare_tables(h_function, self.board, self.goal_state)
+
+        if verbose:
+            print('Got my init state: \n{}'.format(self.init_state))
+            print('Start working to find solution using HDA* with {} workers...\n'.format(workers))
+
+        inboxes = [mp.Queue() for _ in range(workers)]
+        results = mp.Queue()
+        processes = [mp.Process(target=run_worker, args=(i, self.board.size, self.goal_state, h_function,
+                                                         inboxes, results, self.stats.profiled), daemon=True)
+                     for i in range(workers)]
+
+        for process in processes:
+            process.start()
+
+        try:
+
+            init_h = self.heuristic(h_function)(self.init_state.state)
+            inboxes[owner(self.init_state.state, workers)].put(
+                ('nodes', [(self.init_state.state, 0, init_h, None, self.init_state.blank)]))
+
+            incumbent = np.inf
+            stats = self.stats
+            wave = 0
+            previous = None
+            statuses = []
+
+            while True:
+
+                # Collect a wave of probes, broadcast the incumbent when it's improved meanwhile
+                wave += 1
+                for inbox in inboxes:
+                    inbox.put(('probe', wave))
+
+                statuses.clear()
+                wave_end = None
+
+                while len(statuses) < workers or time() < wave_end:
+
+                    try:
+                        message = results.get(timeout=PROBE_INTERVAL)
+
+                    except Empty:
+                        continue
+
+                    if message[0] == 'goal' and message[1] < incumbent:
+                        incumbent = message[1]
+                        for inbox in inboxes:
+                            inbox.put(('incumbent', incumbent))
+
+                    elif message[0] == 'status' and message[1] == wave:
+                        statuses.append(message)
+                        if len(statuses) == workers:
+                            wave_end = time() + PROBE_INTERVAL
+
+                worker_stats = [status[7] for status in statuses]
+                for field in WORKER_STATS_FIELDS[:None if stats.profiled else -2]:
+                    setattr(stats, field, sum(getattr(worker, field) for worker in worker_stats))
+                counters = (all(status[3] for status in statuses),
+                            sum(status[4] for status in statuses) + 1, sum(status[5] for status in statuses))
+
+                if verbose:
+                    print_status(stats.expanded, sum(status[6] for status in statuses), incumbent)
+
+                # Terminated - two consecutive idle waves with the same counts, all the batches were received
+                if counters[0] and counters[1] == counters[2] and counters == previous:
+                    break
+
+                previous = counters
+                self.check_deadline()
+
+            if incumbent == np.inf:
+                return
+
+            # Trace the solution back through the owners of its states
+            states, blanks = [self.goal], []
+            while True:
+
+                inboxes[owner(states[-1], workers)].put(('trace', states[-1]))
+
+                message = results.get()
+                while message[0] != 'parent':
+                    message = results.get()
+
+                _, _, parent, blank = message
+                blanks.append(blank)
+
+                if parent is None:
+                    break
+
+                states.append(parent)
+
+            states.reverse()
+            blanks.reverse()
+            self.solution = self.path_to_node(states, blanks)
+
+            if verbose:
+                print_finished(stats.expanded)
+
+        finally:
+
+            for inbox in inboxes:
+                inbox.put(('stop',))
+
+            for process in processes:
+                process.join()
+
+    @instrumented
+    def ara_star_solve(self, h_function, verbose=True, weight=3, decrement=0.5):
+        """
+        This method implement ARA* (Anytime Repairing A*).
+        Weighted A* searches with a decreasing weight, which reuse the previous search. States which
+        improved after they were closed are kept aside (INCONS) and reopened by the next search.
+        After each search the suboptimality bound is min(w, cost / min(g + h)) over the open and
+        inconsistent states. The search stops when the bound reach 1, or at the time limit with
+        the best solution found so far (and `timed_out` set).
+        :param decrement: float, the decrease of the weight after each search
+        :param weight: float, the initial weight
+        :param verbose: bool, if to print log messages
+        :param h_function: heuristic function for f function.
+        :return: SearchStats, the solution (Node) is kept in the `solution` attribute
+        """
+
+        board = self.board
+        goal = self.goal
+        h = self.heuristic(h_function)
+        stats = self.stats
+
+        self.solution = None
+        self.bound = None
+
+        init_h = h(self.init_state.state)
+        if init_h == np.inf:
+            return
+
+        g_values = {self.init_state.state: 0}
+        h_values = {self.init_state.state: init_h}
+        parents = {self.init_state.state: None}
+        blanks = {self.init_state.state: self.init_state.blank}
+        open_set = {self.init_state.state}
+        closed, incons = set(), set()
+        counter = 0
+        push, pop = stats.timed(heapq.heappush), stats.timed(heapq.heappop)
+
+        def build_open_list():
+            nonlocal counter
+            entries = [(g_values[s] + weight * h_values[s], h_values[s], i, s) for i, s in enumerate(open_set, counter)]
+            counter += len(open_set)
+            heapq.heapify(entries)
+            return entries
+
+        def improve_path():
+            nonlocal counter
+
+            while len(open_list) > 0:
+
+                f_value, _, _, state = open_list[0]
+
+                # Stale entry, the state was closed or its g value improved
+                if state not in open_set or f_value != g_values[state] + weight * h_values[state]:
+                    pop(open_list)
+                    continue
+
+                if g_values.get(goal, np.inf) <= f_value:
+                    return
+
+                stats.frontier(len(open_list))
+                pop(open_list)
+                open_set.discard(state)
+                closed.add(state)
+
+                stats.expanded += 1
+                if stats.expanded % DEADLINE_CHECK_INTERVAL == 0:
+                    self.check_deadline()
+
+                if verbose and stats.expanded % 300 == 0:
+                    print_status(stats.expanded, len(open_set))
+
+                blank = blanks[state]
+                g_value = g_values[state] + 1
+
+                stats.generated += len(board.moves[blank])
+                for cell in board.moves[blank]:
+
+                    child = board.slide(state, blank, cell)
+
+                    if g_value >= g_values.get(child, np.inf):
+                        stats.duplicates += 1
+                        continue
+
+                    if child not in h_values:
+                        h_values[child] = h.update(h_values[state], state, blank, cell, child)
+
+                    if h_values[child] == np.inf:
+                        stats.pruned += 1
+                        continue
 
-                if tuple(child.flatten()) not in close_set:
-                    f_value = g_value + h_function(child, self.goal_state)
-                    open_list.append(Node(child, f_value, parent))
+                    g_values[child] = g_value
+                    parents[child] = state
+                    blanks[child] = cell
 
-            # Best-First: sort the open list
-            open_list.sort(key=lambda x: x.lb)
+                    if child in closed:
+                        incons.add(child)
 
-            # Update close set
-            close_set.add(tuple(parent.table.flatten()))
+                    else:
+                        open_set.add(child)
+                        counter += 1
+                        push(open_list, (g_value + weight * h_values[child], h_values[child], counter, child))
 
-        self.solution = solution
+        if verbose:
+            print('Got my init state: \n{}'.format(self.init_state))
+            print('Start working to find solution using ARA*...\n')
+
+        open_list = build_open_list()
+        reported_bound = np.inf
+
+        while True:
+
+            try:
+                improve_path()
+
+            # Anytime - return the best solution found so far
+            except TimeoutError:
+                if self.solution is None:
+                    raise
+                self.timed_out = True
+                break
+
+            if goal not in g_values:
+                break
+
+            # The bound of this solution
+            lower = min([g_values[s] + h_values[s] for s in open_set | incons], default=np.inf)
+            self.bound = min(weight, g_values[goal] / lower) if lower > 0 else weight
+            self.bound = max(self.bound, 1)
+
+            path = [goal]
+            while parents[path[-1]] is not None:
+                path.append(parents[path[-1]])
+            path.reverse()
+
+            # A smaller weight may only tighten the bound of the same solution
+            if self.solution is None or len(path) - 1 < self.solution.lb or self.bound < reported_bound:
+                self.report_improvement(path, [blanks[s] for s in path], self.bound)
+                reported_bound = self.bound
+
+            self.solution = self.path_to_node(path, [blanks[s] for s in path])
+
+            if verbose:
+                print('\nSolution with cost {} and bound {:.3f}'.format(g_values[goal], self.bound))
+
+            if self.bound <= 1:
+                break
+
+            # Decrease the weight and reopen the inconsistent states
+            weight = max(1, weight - decrement)
+            open_set |= incons
+            incons.clear()
+            closed.clear()
+            open_list = build_open_list()
+
+        if verbose:
+            print_finished(stats.expanded)
+
+        stats.estimate_bytes((init_h, init_h, counter, goal), g_values, h_values, parents, blanks, closed)
+
+    @instrumented
+    def beam_solve(self, h_function, verbose=True, beam_width=100):
+        """
+        This method implement beam search, Breadth-First search which keep only the beam_width best
+        states (by h) of each layer. The suboptimality bound is computed from the f values of the
+        pruned states, the optimal path either stayed in the beam or has a pruned state with f <= the
+        optimal cost.
+        :param beam_width: int, number of states kept in each layer
+        :param verbose: bool, if to print log messages
+        :param h_function: heuristic function for f function.
+        :return: SearchStats, the solution (Node) is kept in the `solution` attribute
+        """
+
+        board = self.board
+        goal = self.goal
+        h = self.heuristic(h_function)
+        stats = self.stats
+
+        self.solution = None
+        self.bound = None
+
+        init_h = h(self.init_state.state)
+        layer = [(init_h, self.init_state.state, self.init_state.blank)]
+        parents = {self.init_state.state: None}
+        blanks = {self.init_state.state: self.init_state.blank}
+        pruned_f = np.inf
+        depth = 0
+
+        def select(children):
+
+            children.sort(key=lambda x: x[0])
+            return children[:beam_width], children[beam_width:]
+
+        push, select = stats.timed(list.append), stats.timed(select)
+
+        if verbose:
+            print('Got my init state: \n{}'.format(self.init_state))
+            print('Start working to find solution using beam search...\n')
+
+        while goal not in parents and len(layer) > 0:
+
+            children = []
+            depth += 1
+
+            for h_value, state, blank in layer:
+
+                stats.expanded += 1
+                if stats.expanded % DEADLINE_CHECK_INTERVAL == 0:
+                    self.check_deadline()
+
+                stats.generated += len(board.moves[blank])
+                for cell in board.moves[blank]:
+
+                    child = board.slide(state, blank, cell)
+
+                    if child in parents:
+                        stats.duplicates += 1
+                        continue
+
+                    child_h = h.update(h_value, state, blank, cell, child)
+
+                    if child_h != np.inf:
+                        parents[child] = state
+                        blanks[child] = cell
+                        push(children, (child_h, child, cell))
+
+                    else:
+                        stats.pruned += 1
+
+            # Keep the best states, the pruned ones are released for other paths
+            stats.frontier(len(children))
+            layer, dropped = select(children)
+            for child_h, child, _ in dropped:
+                pruned_f = min(pruned_f, depth + child_h)
+                del parents[child]
+
+            stats.pruned += len(dropped)
+
+            if verbose:
+                print_status(stats.expanded, len(layer), depth=depth)
+
+        stats.estimate_bytes((init_h, self.init_state.state, self.init_state.blank), parents, blanks)
+
+        if goal not in parents:
+            return
+
+        path = [goal]
+        while parents[path[-1]] is not None:
+            path.append(parents[path[-1]])
+        path.reverse()
+
+        cost = len(path) - 1
+        lower = max(init_h, min(cost, pruned_f))
+        self.bound = cost / lower if lower > 0 else 1
+        self.solution = self.path_to_node(path, [blanks[s] for s in path])
+
+        if verbose:
+            print_finished(stats.expanded)
+
+    @instrumented
+    def bidirectional_solve(self, h_function, verbose=True):
+        """
+        This method implement MM, bidirectional heuristic search which meets in the middle.
+        A forward search from the init state and a backward search from the goal state, the backward
+        search use the heuristic compiled for the init state. The heuristics with precomputed tables (pattern
+        databases, the oracle) are not compiled again for the init state, their tables for the goal state are
+        reused by relabelling the tiles (see `RelabelledHeuristic`). A node's priority is max(f, 2g), and
+        the side with the lowest priority is expanded. Each generated state is looked up in the
+        other side's g values to update the best meeting cost (UB). The search stops when the UB is
+        not larger than the lowest priority, which is a lower bound on the cost of any other solution.
+        :param verbose: bool, if to print log messages
+        :param h_function: heuristic function for f function.
+        :return: SearchStats, the solution (Node) is kept in the `solution` attribute
+        """
+
+        board = self.board
+        init = self.init_state
+        stats = self.stats
+
+        if isinstance(h_function, MappedTables):
+            backward_h = RelabelledHeuristic(compile_heuristic(h_function, board, self.goal_state), board,
+                                             self.goal_state, self.init_state.table)
+        else:
+            backward_h = compile_heuristic(h_function, board, self.init_state.table)
+
+        # Each side: [heuristic, open list, {state: g value}, {state: parent state}]
+        forward = [self.heuristic(h_function), [], {init.state: 0}, {init.state: None}]
+        backward = [TimedHeuristic(backward_h, stats) if stats.profiled else backward_h, [],
+                    {self.goal: 0}, {self.goal: None}]
+        push, pop = stats.timed(heapq.heappush), stats.timed(heapq.heappop)
+
+        for side, state, blank in [(forward, init.state, init.blank), (backward, self.goal, board.blank(self.goal))]:
+            h_value = side[0](state)
+            side[1].append((max(h_value, 0), 0, 0, state, blank, h_value))
+
+        ub = 0 if init.state == self.goal else np.inf
+        meet = init.state
+        counter = 1
+
+        # Verbose
+        if verbose:
+            print('Got my init state: \n{}'.format(self.init_state))
+            print('Start working to find solution using MM...\n')
+
+        while True:
+
+            # Remove stale entries from the top of the open lists
+            for h, open_list, g_values, _ in (forward, backward):
+                while len(open_list) > 0 and open_list[0][1] > g_values[open_list[0][3]]:
+                    pop(open_list)
+
+            if len(forward[1]) == 0 or len(backward[1]) == 0:
+                break
+
+            # Termination, no solution is cheaper than the lowest priority
+            lowest = min(forward[1][0][0], backward[1][0][0])
+            if ub <= lowest:
+                break
+
+            stats.expanded += 1
+            if stats.expanded % DEADLINE_CHECK_INTERVAL == 0:
+                self.check_deadline()
+
+            if verbose and stats.expanded % 300 == 0:
+                print_status(stats.expanded, len(forward[1]) + len(backward[1]), ub)
+
+            # Expand the side with the lowest priority
+            side, other = (forward, backward) if forward[1][0][0] <= backward[1][0][0] else (backward, forward)
+            h, open_list, g_values, parents = side
+
+            stats.frontier(len(forward[1]) + len(backward[1]))
+            _, g_value, _, state, blank, h_value = pop(open_list)
+            g_value += 1
+
+            stats.generated += len(board.moves[blank])
+            for cell in board.moves[blank]:
+
+                child = board.slide(state, blank, cell)
+
+                if g_value >= g_values.get(child, np.inf):
+                    stats.duplicates += 1
+                    continue
+
+                g_values[child] = g_value
+                parents[child] = state
+
+                # Meet in the middle
+                if child in other[2] and g_value + other[2][child] < ub:
+                    ub = g_value + other[2][child]
+                    meet = child
+
+                child_h = h.update(h_value, state, blank, cell, child)
+
+                if child_h == np.inf:
+                    stats.pruned += 1
+                    continue
+
+                push(open_list, (max(g_value + child_h, 2 * g_value), g_value, counter, child, cell, child_h))
+                counter += 1
+
+        if verbose:
+            print_finished(stats.expanded)
+
+        stats.estimate_bytes((ub, ub, counter, meet, 0, ub), forward[2], forward[3], backward[2], backward[3])
+
+        if ub == np.inf:
+            self.solution = None
+            return
+
+        # Join the forward path to the meeting state and the backward path from it
+        path = []
+        state = meet
+        while state is not None:
+            path.append(state)
+            state = forward[3][state]
+
+        path.reverse()
+
+        state = backward[3][meet]
+        while state is not None:
+            path.append(state)
+            state = backward[3][state]
+
+        self.solution = self.path_to_node(path, [board.blank(state) for state in path])
+
+    @instrumented
+    def ida_star_solve(self, h_function, verbose=True):
+        """
+        This method implement IDA* algorithm.
+        Depth-First iterations bounded by f = g + h, each iteration raise the bound to the smallest
+        f value which exceeded the previous bound. The search keep only the current path, moves
+        are made and undone on it, so the memory is O(depth). The move which undo the previous
+        move is pruned.
+        :param verbose: bool, if to print log messages
+        :param h_function: heuristic function for f function.
+        :return: SearchStats, the solution (Node) is kept in the `solution` attribute
+        """
+
+        board = self.board
+        goal = self.goal
+        h = self.heuristic(h_function)
+        found = -1
+
+        # The current path, the last state is the current state
+        path = [self.init_state.state]
+        blanks = [self.init_state.blank]
+        stats = self.stats
+        push_state, push_blank = stats.timed(path.append), stats.timed(blanks.append)
+        pop_state, pop_blank = stats.timed(path.pop), stats.timed(blanks.pop)
+
+        def search(g_value, bound, h_value):
+
+            state = path[-1]
+            blank = blanks[-1]
+
+            f_value = g_value + h_value
+
+            if f_value > bound:
+                stats.pruned += 1
+                return f_value
+
+            if state == goal:
+                return found
+
+            stats.expanded += 1
+            if stats.expanded % DEADLINE_CHECK_INTERVAL == 0:
+                self.check_deadline()
+
+            stats.frontier(len(path))
+            minimum = np.inf
+            previous = blanks[-2] if len(blanks) > 1 else -1
+
+            for cell in board.moves[blank]:
+
+                # Don't undo the previous move
+                if cell == previous:
+                    stats.duplicates += 1
+                    continue
+
+                stats.generated += 1
+
+                # Make the move
+                child = board.slide(state, blank, cell)
+                push_state(child)
+                push_blank(cell)
+
+                result = search(g_value + 1, bound, h.update(h_value, state, blank, cell, child))
+
+                if result == found:
+                    return found
+
+                minimum = min(minimum, result)
+
+                # Undo the move
+                pop_state()
+                pop_blank()
+
+            return minimum
+
+        # Verbose
+        if verbose:
+            print('Got my init state: \n{}'.format(self.init_state))
+            print('Start working to find solution using IDA*...\n')
+
+        self.solution = None
+
+        # With an infinite bound the iteration would search the whole unreachable component
+        init_h = h(self.init_state.state)
+        if init_h == np.inf:
+            return
+
+        bound = init_h
+
+        while True:
+
+            result = search(0, bound, init_h)
+
+            if verbose:
+                print_status(stats.expanded, len(path), bound)
+
+            if result == found:
+                break
+
+            # No state exceeded the bound - the whole reachable space was searched
+            if result == np.inf:
+                self.solution = None
+                return
+
+            bound = result
+
+        if verbose:
+            print_finished(stats.expanded)
+
+        stats.estimate_bytes((self.init_state.state, self.init_state.blank))
+
+        self.solution = self.path_to_node(path, blanks)
+
+    @instrumented
+    def oracle_solve(self, verbose=True):
+        """
+        This method return an optimal solution using the distance oracle, the exact distance of
+        every state which is computed once per goal. The solution is found by greedy descent
+        on the distances, in O(solution length).
+        :param verbose: bool, if to print log messages
+        :return: SearchStats, the solution (Node) is kept in the `solution` attribute
+        """
+
+        if verbose:
+            print('Got my init state: \n{}'.format(self.init_state))
+            print('Looking for solution using the distance oracle...\n')
+
+        path = self.heuristic(ORACLE).path(self.init_state.state, self.init_state.blank)
+
+        if path is None:
+            self.solution = None
+            return
+
+        self.stats.expanded = len(path) - 1
+
+        self.solution = self.path_to_node([state for state, _ in path], [blank for _, blank in path])
+
+    @instrumented
+    def layered_bfs_solve(self, verbose=True):
+        """
+        This method implement Breadth-First search which expand a whole layer at once with numpy,
+        without python objects per node. The layers are kept to trace the solution back from the goal.
+        The children of a layer which are not in the next layer (in the previous layer, or generated more
+        than once) are counted as duplicates.
+        :param verbose: bool, if to print log messages
+        :return: SearchStats, the solution (Node) is kept in the `solution` attribute
+        """
+
+        if verbose:
+            print('Got my init state: \n{}'.format(self.init_state))
+            print('Start working to find solution using layered BFS...\n')
+
+        layers = []
+        stats = self.stats
+        self.solution = None
+        children = 0
+
+        for layer in bfs_layers(self.board, self.init_state.state):
+
+            layers.append(layer)
+            self.check_deadline()
+            stats.duplicates += children - len(layer) if len(layers) > 1 else 0
+            stats.frontier(len(layer))
+            stats.bytes += layer.nbytes
+
+            if verbose:
+                print_status(len(layers) - 1, len(layer))
+
+            if contains(layer, self.goal):
+                path = trace_path(self.board, layers, self.goal)
+                self.solution = self.path_to_node(path, [self.board.blank(state) for state in path])
+                break
+
+            # The layer is expanded by the next step of the generator
+            children = count_children(self.board, layer)
+            stats.expanded += len(layer)
+            stats.generated += children
+
+        if verbose:
+            print_finished(len(layers))
+
+    def path_to_node(self, states, blanks):
+        """
+        Build the nodes of a path which start at the init state
+        :param states: list with the packed states of the path
+        :param blanks: list with the blank cell of each state
+        :return: the last node of the path
+        """
+
+        node = self.init_state
+        for g_value in range(1, len(states)):
+            node = Node(self.board, states[g_value], blanks[g_value], g_value, node)
+
+        return node
+
+    def replay(self, moves):
+        """
+        Build the nodes of a path from the init state and its moves
+        :param moves: sequence with the cells the blank moves to
+        :return: the last node of the path
+        """
+
+        states, blanks = [self.init_state.state], [self.init_state.blank]
+
+        for cell in moves:
+            states.append(self.board.slide(states[-1], blanks[-1], cell))
+            blanks.append(cell)
+
+        return self.path_to_node(states, blanks)
+
+    def check_deadline(self):
+        """
+        Stop the search if its time limit passed or it was stopped, report the progress to the
+        listener of `solve_iter()` and call the hook
+        :return:
+        """
+
+        now = time()
+
+        if self.hook is not None:
+            self.hook(self.stats)
+
+        if self.stopped or ((self.deadline is not None) and (now > self.deadline)):
+            raise TimeoutError('The search passed its time limit')
+
+        if (self.listener is not None) and (self.progress_interval is not None) and \
+                (now - self._last_progress >= self.progress_interval):
+            self._last_progress = now
+            self.listener(SolveEvent('progress', None, None, self.stats.expanded, now - self._started))
+
+    def heuristic(self, h_function):
+        """
+        Get the heuristic compiled for the goal state
+        :param h_function: heuristic function which get current table and goal table, or heuristic object
+        :return: Heuristic object, which get packed state and return the h value
+        """
+
+        try:
+            h = self._heuristics[h_function]
+
+        except KeyError:
+            h = self._heuristics[h_function] = compile_heuristic(h_function, self.board, self.goal_state)
+
+        return TimedHeuristic(h, self.stats) if self.stats.profiled else h
+
+    def reflection(self):
+        """
+        Get the reflection of the states which keeps the goal in place (see `Symmetry`), used to keep a single
+        node for a state and its reflection in the closed sets of A* and BFS B&B. The goal is its own reflection,
+        so the path from a state's reflection to the goal is reflected to a path of the same length from the
+        state to the goal - whichever of the two is reached first (cheapest), the optimal cost is kept. The
+        nodes keep the actual states and each node is a child of its parent node, so the path is traced as usual.
+        :return: tuple (function which get a packed state and return its reflection, tuple with the reflected
+                 cell of each cell), the identity if the goal has no symmetry
+        """
+
+        symmetry = Symmetry.of(self.board, self.goal)
+
+        if symmetry is None:
+            return (lambda state: state), tuple(range(self.board.n_cells))
+
+        return symmetry.reflect, symmetry.cells
 
     @staticmethod
-    def is_solvable(table):
+    def is_solvable(table, goal_table=None):
         """
-        Check if a given init table is solvable
+        Check if a given init table is solvable, i.e. if the goal table is reachable from it.
+        Every move swap the blank with a tile, so it flips the permutation parity (blank included)
+        together with the parity of the blank's row + column, and their sum is invariant.
         :param table: init table
+        :param goal_table: goal table, optional. by default the tiles in order and the blank last
         :return: bool answer
         """
 
-        count = 0
-        table = table.flatten()
+        if goal_table is None:
+            goal_table = EightPuzzle.goal_table(len(table))
 
-        for i in range(len(table)):
-            for j in range(i + 1, len(table)):
-                if (table[i] > table[j]) & (table[j] != 0):
-                    count += 1
-
-        return count % 2 == 0
+        return solvability_parity(table) == solvability_parity(goal_table)
 
     @staticmethod
-    def init_table(seed=None):
+    def init_table(seed=None, size=3):
         """
-        This function create initial state of the 8-table.
-        The function return only solvable init table.
+        This function create initial state of the puzzle.
+        The function return only solvable init table (with respect to the default goal table).
+        For many tables use `sampling.sample_tables()`.
         :param seed: seed to the random function, optional
+        :param size: the width of the table
         :return:
         """
 
-        if seed is not None:
-            rnd.seed(seed)
-
-        table = np.array(rnd.sample(range(9), 9)).reshape((3, 3))
+        return next(sample_tables(1, size, seed))[0]
 
-        while not EightPuzzle.is_solvable(table):
-            table = np.array(rnd.sample(range(9), 9)).reshape((3, 3))
+    @staticmethod
+    def goal_table(size=3):
+        """
+        The default goal table, the tiles in order and the blank in the last cell
+        :param size: the width of the table
+        :return: ndarray with shape (size, size)
+        """
 
-        return table
+        return np.append(np.arange(1, size * size), 0).reshape((size, size))
 
     @staticmethod
     def reconstruct_solution(solution):
 
-        solution_list = [solution]
-        node = solution.parent
+        solution_list = []
+        node = solution
 
         while node is not None:
-            solution_list.insert(0, node)
+            solution_list.append(node)
             node = node.parent
 
+        solution_list.reverse()
+
         return solution_list
 
 
+def heap_key(integral, f_value, h_value, handle):
+    """
+    Build the open list entry of a node, ordered by (f, h, insertion order). Handles are given in
+    insertion order, so for integral heuristics the entry is a single int and not a tuple.
+    :param integral: bool, if the f and h values are ints
+    :param f_value: the f value of the node
+    :param h_value: the h value of the node
+    :param handle: the handle of the node
+    :return: the heap entry
+    """
+
+    if integral:
+        return (f_value << 56) | (h_value << HANDLE_BITS) | handle
+
+    return f_value, h_value, handle
+
+
+def heap_handle(key):
+    """
+    Get the handle of a node from its open list entry, see `heap_key`
+    :param key: the heap entry
+    :return: the handle of the node
+    """
+
+    if isinstance(key, tuple):
+        return key[2]
+
+    return key & HANDLE_MASK
+
+
+def suboptimality(cost, lower_bound):
+    """
+    The suboptimality bound of a solution
+    :param cost: the cost of the solution
+    :param lower_bound: lower bound of the optimal cost
+    :return: cost / lower_bound, inf if there is no lower bound
+    """
+
+    if cost == 0:
+        return 1
+
+    return cost / lower_bound if lower_bound > 0 else np.inf
+
+
 def print_status(iteration, open_list_length, ub=None, depth=None):
     # Build the status log
     if ub is not None:
@@ -242,17 +1532,14 @@ def print_finished(iterations):
     print('\n\nTotal iterations: {}\n'.format(iterations))
 
 
-def get_all_parents(node):
+def solvability_parity(table):
     """
-    Get a set with all the parents of this parent node (including himself)
-    :param node: first parent.
-    :return: set with all the parents while each parent is tuple
+    Get the solvability invariant of a table, see `EightPuzzle.is_solvable`
+    :param table: ndarray with shape (size, size)
+    :return: 0 or 1
     """
 
-    parents = set()
-
-    while node is not None:
-        parents.add(tuple(node.table.flatten()))
-        node = node.parent
+    tiles = np.asarray(table).flatten().tolist()
+    row, col = divmod(tiles.index(0), len(table))
 
-    return parents
+    return permutation_parity(tiles) ^ ((row + col) & 1)
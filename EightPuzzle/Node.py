@@ -1,94 +1,48 @@
-import numpy as np
-import copy
+from .Board import Board
 
 
 class Node:
 
-    def __init__(self, table, lb, parent):
+    __slots__ = ('board', 'state', 'blank', 'lb', 'parent')
 
-        self.table = table
+    def __init__(self, board, state, blank, lb, parent):
 
-        self.lb = lb
-
-        self.parent = copy.copy(parent)
-
-    def expand(self):
-
-        children = []
-        empty_cell = np.where(self.table == 0)
-        row, col = empty_cell[0][0], empty_cell[1][0]
+        self.board: Board = board
 
-        # Up
-        try:
-            children.append(swap(self.table, (row - 1, col), (row, col)))
-        except IndexError:
-            pass
+        self.state: int = state
 
-        # Down
-        try:
-            children.append(swap(self.table, (row + 1, col), (row, col)))
-        except IndexError:
-            pass
+        self.blank: int = blank
 
-        # Left
-        try:
-            children.append(swap(self.table, (row, col - 1), (row, col)))
-        except IndexError:
-            pass
-
-        # Right
-        try:
-            children.append(swap(self.table, (row, col + 1), (row, col)))
-        except IndexError:
-            pass
-
-        return children
-
-    def depth(self):
+        self.lb = lb
 
-        depth = 0
-        p = self.parent
+        self.parent = parent
 
-        while p is not None:
-            depth += 1
-            p = p.parent
+    @property
+    def table(self):
+        """
+        The node's state as ndarray, for printing and for the ndarray based heuristics
+        :return: ndarray with shape (size, size)
+        """
 
-        return depth
+        return self.board.unpack(self.state)
 
     def __eq__(self, other):
 
         if isinstance(other, Node):
-            return (self.table == other.table).all()
+            return self.state == other.state
 
         return False
 
+    def __hash__(self):
+
+        return hash(self.state)
+
     def __str__(self):
 
+        table = self.table
+        width = len(str(table.size - 1))
         res = ''
-        for i in range(len(self.table)):
-            res += '|' + '|'.join(map(str, self.table[i])) + '| \n'
+        for i in range(len(table)):
+            res += '|' + '|'.join(str(t).rjust(width) for t in table[i]) + '| \n'
 
         return res
-
-
-def swap(table, pos_1, pos_2):
-    """
-    This function swap between two elements in ndarray
-    :param table:
-    :param pos_1: position of the 1st element
-    :param pos_2: position of the 2nd element
-    :return:
-    """
-    # Dont use minus index (python can use it)
-    if -1 in (pos_1 + pos_2):
-        raise IndexError
-
-    # Copy the table
-    table = copy.deepcopy(table)
-
-    # Swap
-    temp = table[pos_1[0]][pos_1[1]]
-    table[pos_1[0]][pos_1[1]] = table[pos_2[0]][pos_2[1]]
-    table[pos_2[0]][pos_2[1]] = temp
-
-    return table
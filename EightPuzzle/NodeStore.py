@@ -0,0 +1,90 @@
+import sys
+from array import array
+from .Board import Board
+
+# Bytes of each node's fields: state, g, f, parent and the blank cell
+FIELDS_BYTES = {'state': 8, 'g': 2, 'f': 8, 'parent': 4, 'blank': 1}
+
+
+class NodeStore:
+    """
+    Class storing search nodes as a struct of arrays.
+    A node is referred by an integer handle, its index in the arrays. Each node holds its packed state,
+    g value, f value, the handle of its parent (-1 for the root) and its blank cell, which is the cell
+    of the last moved tile. So a node costs a fixed number of bytes, see `bytes_per_node`.
+    Packed states which don't fit in 64 bits (boards larger than 4x4) are kept in a list, as a pointer to
+    an int object per node.
+
+    Attributes:
+
+        board:
+            the board of the puzzle
+
+        state, g, f, parent, blank:
+            the arrays of the nodes' fields
+    """
+
+    def __init__(self, board):
+
+        self.board: Board = board
+        self.state = array('Q') if board.n_cells * board.bits <= 64 else []
+        self.g = array('H')
+        self.f = array('d')
+        self.parent = array('i')
+        self.blank = array('B')
+
+    def add(self, state: int, g: int, f, parent: int, blank: int) -> int:
+        """
+        Add a node to the store
+        :param state: packed state
+        :param g: the g value of the node
+        :param f: the f value of the node
+        :param parent: the handle of the parent, -1 for the root
+        :param blank: the blank cell of the state
+        :return: the handle of the node
+        """
+
+        self.state.append(state)
+        self.g.append(g)
+        self.f.append(f)
+        self.parent.append(parent)
+        self.blank.append(blank)
+
+        return len(self.parent) - 1
+
+    def path(self, handle: int):
+        """
+        Get the path from the root to a node by following the parents' handles
+        :param handle: the handle of the last node
+        :return: list of packed states and list of blank cells, from the root to the node
+        """
+
+        states, blanks = [], []
+
+        while handle != -1:
+            states.append(self.state[handle])
+            blanks.append(self.blank[handle])
+            handle = self.parent[handle]
+
+        states.reverse()
+        blanks.reverse()
+
+        return states, blanks
+
+    @property
+    def bytes_per_node(self) -> int:
+        """
+        The bytes of a single node in the arrays, and of its state's int object if the states are in a list
+        """
+
+        if isinstance(self.state, array):
+            return sum(FIELDS_BYTES.values())
+
+        # A pointer in the list and an int as wide as the packed state
+        state_bytes = 8 + sys.getsizeof(1 << (self.board.n_cells * self.board.bits - 1))
+
+        return sum(FIELDS_BYTES.values()) - FIELDS_BYTES['state'] + state_bytes
+
+    def __len__(self):
+
+        return len(self.parent)
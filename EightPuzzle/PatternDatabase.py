@@ -0,0 +1,309 @@
+import numpy as np
+import os
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from .Board import Board
+from .heuristics import Heuristic
+from .ranking import partial_count, partial_rank
+from .Symmetry import Symmetry
+
+# Default directory for the persisted databases
+DATABASES_DIRECTORY = Path(__file__).parent / 'databases'
+
+# Default partition of the tiles for each board size, as group sizes over the goal's tiles (row-major)
+DEFAULT_PARTITIONS = {3: (4, 4), 4: (5, 5, 5), 5: (4, 4, 4, 4, 4, 4)}
+
+# Value of the entries which were not reached while building
+UNREACHED = 255
+
+
+class PatternDatabase:
+    """
+    Class representing a single pattern database.
+    The database holds for each placement of the pattern's tiles the minimal number of moves
+    of the pattern's tiles needed to bring them to their goal cells. Moves of other tiles are free,
+    so databases of disjoint patterns can be summed.
+
+    Attributes:
+
+        board:
+            the board of the puzzle
+
+        pattern:
+            tuple with the tiles of the pattern
+
+        table:
+            uint8 ndarray indexed by the rank of the pattern's tiles positions
+
+        cells:
+            tuple mapping the cells before the lookup, for a database which shares the table of its reflected
+            pattern (see `reflected`), None for a database of its own table
+    """
+
+    def __init__(self, board, pattern, table, cells=None):
+
+        self.board: Board = board
+        self.pattern: Tuple[int, ...] = tuple(pattern)
+        self.table: np.ndarray = table
+        self.cells: Optional[Tuple[int, ...]] = cells
+
+    @classmethod
+    def build(cls, board: Board, goal: int, pattern) -> 'PatternDatabase':
+        """
+        Build the database by retrograde 0-1 BFS from the goal. The abstract state is the positions
+        of the pattern's tiles and the blank, moving a pattern's tile costs 1 and other moves are free.
+        :param board: the board of the puzzle
+        :param goal: the packed goal state
+        :param pattern: sequence with the tiles of the pattern
+        :return: PatternDatabase object
+        """
+
+        n = board.n_cells
+        moves = board.moves
+        pattern = tuple(pattern)
+        goal_tiles = board.tiles(goal)
+
+        table = bytearray([UNREACHED]) * partial_count(n, len(pattern))
+        seen = bytearray(len(table) * n)
+
+        queue = deque([(0, tuple(goal_tiles.index(t) for t in pattern), goal_tiles.index(0))])
+
+        while len(queue) > 0:
+
+            cost, positions, blank = queue.popleft()
+            index = partial_rank(positions, n)
+
+            if seen[index * n + blank]:
+                continue
+
+            seen[index * n + blank] = 1
+
+            # The first time a placement is popped its cost is minimal over all the blank's positions
+            if table[index] == UNREACHED:
+                table[index] = cost
+
+            for cell in moves[blank]:
+
+                # The blank swapped with a pattern's tile
+                if cell in positions:
+                    i = positions.index(cell)
+                    queue.append((cost + 1, positions[:i] + (blank,) + positions[i + 1:], cell))
+
+                # The blank swapped with a tile we don't care about
+                else:
+                    queue.appendleft((cost, positions, cell))
+
+        return cls(board, pattern, np.frombuffer(table, dtype=np.uint8))
+
+    @classmethod
+    def load(cls, board: Board, goal: int, pattern, directory=None) -> 'PatternDatabase':
+        """
+        Memory-map the database from the disk, build and save it first if it doesn't exist.
+        :param board: the board of the puzzle
+        :param goal: the packed goal state
+        :param pattern: sequence with the tiles of the pattern
+        :param directory: directory of the persisted databases, optional
+        :return: PatternDatabase object
+        """
+
+        directory = Path(directory if directory is not None else DATABASES_DIRECTORY)
+        path = directory / 'pdb_{}_{:x}_{}.npy'.format(board.size, goal, '-'.join(map(str, pattern)))
+
+        if not path.exists():
+            database = cls.build(board, goal, pattern)
+            database.save(path)
+
+        return cls(board, pattern, np.load(path, mmap_mode='r'))
+
+    def save(self, path):
+        """
+        Save the table to the disk
+        :param path: path of the file
+        :return:
+        """
+
+        save_table(path, self.table)
+
+    def lookup(self, positions) -> int:
+        """
+        Get the database value for the positions of all the tiles
+        :param positions: sequence where positions[tile] is the cell of the tile
+        :return: the number of moves of the pattern's tiles
+        """
+
+        if self.cells is None:
+            return int(self.table[partial_rank([positions[t] for t in self.pattern], self.board.n_cells)])
+
+        return int(self.table[partial_rank([self.cells[positions[t]] for t in self.pattern], self.board.n_cells)])
+
+    def reflected(self, symmetry: Symmetry) -> 'PatternDatabase':
+        """
+        Get the database of the reflected pattern, which shares this database's table. The value of a state
+        for the reflected pattern is the value of the reflected state for this pattern.
+        :param symmetry: the symmetry of the goal
+        :return: PatternDatabase object
+        """
+
+        return PatternDatabase(self.board, symmetry.reflect_pattern(self.pattern), self.table, symmetry.cells)
+
+
+def save_table(path, table):
+    """
+    Save a table to the disk as .npy file, the file is written aside and renamed so concurrent
+    readers never see a partial file
+    :param path: path of the file
+    :param table: ndarray
+    :return:
+    """
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    temp_path = path.with_name('{}.{}.tmp'.format(path.stem, os.getpid()))
+    with open(temp_path, 'wb') as f:
+        np.save(f, table)
+
+    os.replace(temp_path, path)
+
+
+class MappedTables:
+    """
+    Base class of the heuristics which compile tables saved on the disk, the compiled tables are kept in
+    `_compiled` and memory-mapped. The compiled tables are not pickled (e.g. when the heuristic is sent to
+    another process), the other processes map the saved tables again instead of copying them, so all of
+    them share a single read-only copy.
+    """
+
+    _compiled: dict
+
+    def __getstate__(self):
+
+        state = self.__dict__.copy()
+        state['_compiled'] = dict()
+
+        return state
+
+
+def prepare_tables(h_function, board: Board, goal_table):
+    """
+    Build (or load) the tables of a heuristic before it's sent to other processes, which only map them
+    :param h_function: heuristic function or heuristic object
+    :param board: the board of the puzzle
+    :param goal_table: goal state table, ndarray
+    :return:
+    """
+
+    if isinstance(h_function, MappedTables):
+        h_function.compile(board, goal_table)
+
+
+class AdditivePatternDatabase(MappedTables):
+    """
+    Heuristic summing disjoint pattern databases.
+    The object can be passed as h_function to `EightPuzzle.solve()`, the databases are loaded
+    (or built) once per board and goal and evaluated directly on packed states.
+    When the goal is symmetric (see `Symmetry`) a pattern which is the reflection of another pattern
+    shares its table, e.g. the 4x4 partition [(2, 3, 4, 7, 8), (5, 9, 13, 10, 14), (1, 6, 11, 12, 15)]
+    needs only two tables.
+
+    Attributes:
+
+        partition:
+            list of disjoint tiles groups, or group sizes over the goal's tiles in row-major order.
+            by default according to `DEFAULT_PARTITIONS`
+
+        directory:
+            directory of the persisted databases
+    """
+
+    def __init__(self, partition=None, directory=None):
+
+        self.partition = partition
+        self.directory = directory
+        self._compiled: Dict[Tuple[int, int], CompiledPatternDatabase] = dict()
+
+    def patterns(self, board: Board, goal: int) -> List[Tuple[int, ...]]:
+        """
+        Get the tiles groups of the partition for a given goal
+        :param board: the board of the puzzle
+        :param goal: the packed goal state
+        :return: list with the tiles of each pattern
+        """
+
+        partition = self.partition if self.partition is not None else DEFAULT_PARTITIONS[board.size]
+
+        # Partition given as tiles
+        if not isinstance(partition[0], int):
+            return [tuple(pattern) for pattern in partition]
+
+        # Partition given as group sizes, split the goal's tiles in row-major order
+        tiles = [t for t in board.tiles(goal) if t != 0]
+        patterns, start = [], 0
+
+        for group_size in partition:
+            patterns.append(tuple(tiles[start:start + group_size]))
+            start += group_size
+
+        return patterns
+
+    def compile(self, board: Board, goal_table) -> 'CompiledPatternDatabase':
+        """
+        Load the databases for a given goal
+        :param board: the board of the puzzle
+        :param goal_table: goal state table, ndarray
+        :return: CompiledPatternDatabase object, which get a packed state and return the h value
+        """
+
+        goal = board.pack(goal_table)
+
+        try:
+            return self._compiled[board.size, goal]
+
+        except KeyError:
+            pass
+
+        symmetry = Symmetry.of(board, goal)
+        databases = []
+
+        for pattern in self.patterns(board, goal):
+
+            # A pattern which is the reflection of a loaded one shares its table
+            mirrors = [] if symmetry is None else [
+                database for database in databases
+                if database.cells is None and sorted(symmetry.reflect_pattern(database.pattern)) == sorted(pattern)]
+
+            if len(mirrors) > 0:
+                databases.append(mirrors[0].reflected(symmetry))
+
+            else:
+                databases.append(PatternDatabase.load(board, goal, pattern, self.directory))
+
+        compiled = self._compiled[board.size, goal] = CompiledPatternDatabase(board, goal_table, databases)
+
+        return compiled
+
+    def __call__(self, table, goal_table):
+
+        board = Board.of(len(table))
+
+        return self.compile(board, goal_table)(board.pack(table))
+
+
+class CompiledPatternDatabase(Heuristic):
+    """
+    Additive pattern databases of a specific goal, evaluated on packed states
+    """
+
+    def __init__(self, board, goal_table, databases):
+
+        super().__init__(board, goal_table)
+        self.databases: List[PatternDatabase] = databases
+
+    def __call__(self, state: int) -> int:
+
+        positions = [0] * self.board.n_cells
+        for cell, tile in enumerate(self.board.tiles(state)):
+            positions[tile] = cell
+
+        return sum(database.lookup(positions) for database in self.databases)
@@ -0,0 +1,216 @@
+import sys
+from time import perf_counter
+
+
+class SearchStats:
+    """
+    Class collecting the statistics of a single search, see `EightPuzzle.stats`.
+    The counters are always collected. The timings of the heuristic and of the frontier operations
+    are measured only in profiled searches (`solve(..., profile=True)`), since timing every call
+    slows the search down.
+
+    Attributes:
+
+        expanded:
+            number of expanded nodes
+
+        generated:
+            number of generated children
+
+        pruned:
+            number of nodes which were cut by the bound, or their heuristic found them a dead end
+
+        duplicates:
+            number of children which were dropped since their state was already reached by a path
+            which is not worse (in DFS searches - the state is on the current path)
+
+        peak_frontier:
+            the largest number of nodes waiting to be expanded
+
+        bytes:
+            estimated peak memory of the search's containers
+
+        heuristic_time, frontier_time:
+            seconds spent in the heuristic and in the frontier operations, None if not profiled.
+            Layered BFS and the oracle's descent are not split into heuristic and frontier operations,
+            they leave both at 0
+
+        run_time:
+            seconds from the start of the search to its end (or until now while it's running)
+    """
+
+    __slots__ = ('expanded', 'generated', 'pruned', 'duplicates', 'peak_frontier', 'bytes', 'heuristic_time',
+                 'frontier_time', 'started', 'finished')
+
+    def __init__(self, profile=False):
+
+        self.expanded = 0
+        self.generated = 0
+        self.pruned = 0
+        self.duplicates = 0
+        self.peak_frontier = 0
+        self.bytes = 0
+        self.heuristic_time = 0.0 if profile else None
+        self.frontier_time = 0.0 if profile else None
+        self.started = perf_counter()
+        self.finished = None
+
+    @property
+    def profiled(self) -> bool:
+
+        return self.heuristic_time is not None
+
+    def finish(self):
+        """
+        Mark the end of the search
+        :return:
+        """
+
+        if self.finished is None:
+            self.finished = perf_counter()
+
+    @property
+    def run_time(self) -> float:
+
+        return (self.finished if self.finished is not None else perf_counter()) - self.started
+
+    @property
+    def expansion_time(self):
+        """
+        Seconds spent in the expansions besides the heuristic and the frontier operations (generating
+        the children, duplicate detection, bookkeeping), None if not profiled
+        """
+
+        if not self.profiled:
+            return None
+
+        return self.run_time - self.heuristic_time - self.frontier_time
+
+    @property
+    def expansions_per_second(self) -> float:
+
+        run_time = self.run_time
+
+        return self.expanded / run_time if run_time > 0 else 0.0
+
+    def frontier(self, size: int):
+        """
+        Record the current size of the frontier
+        :param size: number of nodes waiting to be expanded
+        :return:
+        """
+
+        if size > self.peak_frontier:
+            self.peak_frontier = size
+
+    def timed(self, operation):
+        """
+        Wrap a frontier operation to measure its time, in profiled searches
+        :param operation: function
+        :return: the function, or a wrapper of it which adds its time to `frontier_time`
+        """
+
+        if not self.profiled:
+            return operation
+
+        def timed_operation(*args):
+
+            start = perf_counter()
+            result = operation(*args)
+            self.frontier_time += perf_counter() - start
+
+            return result
+
+        return timed_operation
+
+    def estimate_bytes(self, frontier_entry, *containers):
+        """
+        Estimate the peak memory of the search, the peak frontier and the containers of the search at its end
+        :param frontier_entry: a sample entry of the frontier, None if the frontier is not counted
+        :param containers: the containers of the search (lists, dicts, sets, deques), or sizes in bytes
+        :return:
+        """
+
+        total = 0 if frontier_entry is None else self.peak_frontier * (entry_bytes(frontier_entry) + 8)
+
+        for container in containers:
+
+            if isinstance(container, int):
+                total += container
+                continue
+
+            total += sys.getsizeof(container)
+
+            if len(container) == 0:
+                continue
+
+            # The dicts hold pointers to their keys and values, not (key, value) tuples
+            if isinstance(container, dict):
+                key, value = next(iter(container.items()))
+                total += len(container) * (entry_bytes(key) + entry_bytes(value))
+
+            else:
+                total += len(container) * entry_bytes(next(iter(container)))
+
+        self.bytes = max(self.bytes, total)
+
+    def as_dict(self) -> dict:
+
+        return {'expanded': self.expanded, 'generated': self.generated, 'pruned': self.pruned,
+                'duplicates': self.duplicates, 'peak_frontier': self.peak_frontier, 'bytes': self.bytes,
+                'heuristic_time': self.heuristic_time, 'expansion_time': self.expansion_time,
+                'frontier_time': self.frontier_time, 'run_time': self.run_time,
+                'expansions_per_second': self.expansions_per_second}
+
+    def __str__(self):
+
+        return 'Expanded: {}, Generated: {}, Pruned: {}, Duplicates: {}, Peak Frontier: {}, Bytes: {}, ' \
+               'Run Time: {:.4f}, Expansions/s: {:.0f}'.format(self.expanded, self.generated, self.pruned,
+                                                               self.duplicates, self.peak_frontier, self.bytes,
+                                                               self.run_time, self.expansions_per_second)
+
+
+def entry_bytes(entry) -> int:
+    """
+    Estimate the bytes of a container's entry and the objects it refers to (one level deep)
+    :param entry: object
+    :return: int
+    """
+
+    if isinstance(entry, tuple):
+        return sys.getsizeof(entry) + sum(sys.getsizeof(item) for item in entry)
+
+    return sys.getsizeof(entry)
+
+
+class TimedHeuristic:
+    """
+    Compiled heuristic which measures the time of its evaluations, used in profiled searches
+    """
+
+    def __init__(self, heuristic, stats: SearchStats):
+
+        self.heuristic = heuristic
+        self.stats = stats
+        self.integral = heuristic.integral
+
+    def __call__(self, state):
+
+        start = perf_counter()
+        h_value = self.heuristic(state)
+        self.stats.heuristic_time += perf_counter() - start
+
+        return h_value
+
+    def update(self, h_value, state, blank, cell, child):
+
+        start = perf_counter()
+        h_value = self.heuristic.update(h_value, state, blank, cell, child)
+        self.stats.heuristic_time += perf_counter() - start
+
+        return h_value
+
+    def __getattr__(self, name):
+
+        # Other attributes (e.g. the oracle's path) are of the heuristic
+        return getattr(self.heuristic, name)
@@ -0,0 +1,205 @@
+import sqlite3
+from collections import OrderedDict
+from pathlib import Path
+from typing import Tuple
+from .Board import Board
+from .PatternDatabase import DATABASES_DIRECTORY
+
+# Number of pending updates of the entries' last use which are written to the disk together
+TOUCH_BATCH_SIZE = 1000
+
+
+class SolutionCache:
+    """
+    Cache of optimal solutions, an in-memory LRU layer over an sqlite store on the disk.
+    An entry is keyed by the board size, the packed init state and the packed goal state, and holds the moves
+    of the solution as the cells the blank moves to (one byte each). Since every sub-path of an optimal path is
+    optimal, putting a solution also puts an entry for every state along its path.
+    The last use of the entries which are hit (in memory or on the disk) is written to the disk in batches, with
+    the next put, on close, or every TOUCH_BATCH_SIZE hits, so the disk's LRU order follows the memory hits too.
+    Pass the cache to `EightPuzzle.solve()` to skip the search of repeated puzzles.
+
+    Attributes:
+
+        path:
+            the sqlite file, ':memory:' for a cache without persistence
+
+        memory_size:
+            maximal number of entries in memory
+
+        disk_size:
+            maximal number of entries on the disk, the least recently used entries are evicted
+
+        memory_hits, disk_hits, misses:
+            counters of the lookups
+    """
+
+    def __init__(self, path=None, memory_size=100000, disk_size=10000000):
+
+        self.path = str(path if path is not None else DATABASES_DIRECTORY / 'solutions.db')
+        self.memory_size: int = memory_size
+        self.disk_size: int = disk_size
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._memory: OrderedDict = OrderedDict()
+
+        # The last use of the hit entries, {key: clock}, not written to the disk yet
+        self._touched = dict()
+
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        # The solve may run in a background thread, see `EightPuzzle.solve_iter()`
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+
+        with self._connection:
+            self._connection.execute('CREATE TABLE IF NOT EXISTS solutions (size INTEGER, init TEXT, goal TEXT, '
+                                     'moves BLOB, last_used INTEGER, PRIMARY KEY (size, init, goal))')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS solutions_last_used ON solutions (last_used)')
+
+        self._disk_count, clock = self._connection.execute(
+            'SELECT COUNT(*), MAX(last_used) FROM solutions').fetchone()
+        self._clock = clock or 0
+
+    @staticmethod
+    def key(board: Board, init: int, goal: int) -> Tuple[int, str, str]:
+        """
+        The key of an entry, the packed states are kept as hex since they may exceed 64 bits
+        :param board: the board of the puzzle
+        :param init: packed init state
+        :param goal: packed goal state
+        :return: tuple (size, init, goal)
+        """
+
+        return board.size, '{:x}'.format(init), '{:x}'.format(goal)
+
+    def get(self, board: Board, init: int, goal: int):
+        """
+        Get the solution of a puzzle
+        :param board: the board of the puzzle
+        :param init: packed init state
+        :param goal: packed goal state
+        :return: bytes with the cells the blank moves to, or None if the puzzle is not in the cache
+        """
+
+        key = self.key(board, init, goal)
+
+        try:
+            moves = self._memory[key]
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            self._touch(key)
+            return moves
+
+        except KeyError:
+            pass
+
+        row = self._connection.execute('SELECT moves FROM solutions WHERE size = ? AND init = ? AND goal = ?',
+                                       key).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.disk_hits += 1
+        self._touch(key)
+        self._remember(key, row[0])
+
+        return row[0]
+
+    def put(self, board: Board, states, blanks, goal: int):
+        """
+        Put an optimal solution and all its sub-paths
+        :param board: the board of the puzzle
+        :param states: list with the packed states of the solution, from the init state to the goal
+        :param blanks: list with the blank cell of each state
+        :param goal: packed goal state
+        :return:
+        """
+
+        moves = bytes(blanks[1:])
+        self._clock += 1
+
+        entries = [self.key(board, states[i], goal) + (moves[i:], self._clock) for i in range(len(states) - 1)]
+
+        # The init state's entry is remembered last, so it's the most recently used
+        for entry in reversed(entries):
+            self._remember(entry[:3], entry[3])
+
+        with self._connection:
+            self._flush()
+            inserted = self._connection.executemany('INSERT OR IGNORE INTO solutions VALUES (?, ?, ?, ?, ?)',
+                                                    entries).rowcount
+            self._disk_count += inserted
+
+            # Evict the least recently used entries
+            if self._disk_count > self.disk_size:
+                self._disk_count -= self._connection.execute(
+                    'DELETE FROM solutions WHERE rowid IN (SELECT rowid FROM solutions ORDER BY last_used LIMIT ?)',
+                    (self._disk_count - self.disk_size,)).rowcount
+
+    def _touch(self, key):
+
+        self._clock += 1
+        self._touched[key] = self._clock
+
+        if len(self._touched) >= TOUCH_BATCH_SIZE:
+            with self._connection:
+                self._flush()
+
+    def _flush(self):
+
+        # Called inside a transaction
+        self._connection.executemany('UPDATE solutions SET last_used = ? WHERE size = ? AND init = ? AND goal = ?',
+                                     [(clock,) + key for key, clock in self._touched.items()])
+        self._touched.clear()
+
+    def _remember(self, key, moves):
+
+        self._memory[key] = moves
+        self._memory.move_to_end(key)
+
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    @property
+    def hits(self) -> int:
+        """
+        The number of lookups which were found in memory or on the disk
+        """
+
+        return self.memory_hits + self.disk_hits
+
+    def clear(self):
+        """
+        Remove all the entries and reset the counters
+        :return:
+        """
+
+        self._memory.clear()
+        self._touched.clear()
+
+        with self._connection:
+            self._connection.execute('DELETE FROM solutions')
+
+        self._disk_count = 0
+        self.memory_hits = self.disk_hits = self.misses = 0
+
+    def close(self):
+
+        with self._connection:
+            self._flush()
+
+        self._connection.close()
+
+    def __len__(self):
+
+        return self._disk_count
+
+    def __str__(self):
+
+        return 'Entries: {}, Memory Hits: {}, Disk Hits: {}, Misses: {}'.format(len(self), self.memory_hits,
+                                                                                self.disk_hits, self.misses)
@@ -0,0 +1,43 @@
+class SolveEvent:
+    """
+    Class representing an event of a running search, see `EightPuzzle.solve_iter()`.
+
+    Attributes:
+
+        kind:
+            'improvement' - a better solution was found,
+            'progress' - periodic report of a running search,
+            'finished' - the search is over and the solution is the best it can find,
+            'timeout' - the search passed its time limit, the solution is the best found until then
+
+        solution:
+            list of nodes from the init state to the goal state, as returned by `EightPuzzle.solve()`.
+            None for progress events and when no solution was found
+
+        cost:
+            the number of moves in the solution, None if there is no solution
+
+        bound:
+            the suboptimality bound of the solution, its cost is at most bound times the optimal cost
+
+        expansions:
+            the number of expansions so far
+
+        elapsed:
+            seconds since the search started
+    """
+
+    def __init__(self, kind, solution, bound, expansions, elapsed):
+
+        self.kind: str = kind
+        self.solution = solution
+        self.cost = None if solution is None else len(solution) - 1
+        self.bound = bound
+        self.expansions: int = expansions
+        self.elapsed: float = elapsed
+
+    def __str__(self):
+
+        return 'Event: {}, Cost: {}, Bound: {}, Expansions: {}, Elapsed: {:.4f}'.format(self.kind, self.cost,
+                                                                                      self.bound, self.expansions,
+                                                                                      self.elapsed)
@@ -0,0 +1,142 @@
+import numpy as np
+from typing import Dict, Optional, Tuple
+from .Board import Board
+from .layered_bfs import tiles_array
+
+# Maximal number of bits of a packed state which are reflected by a single lookup
+CHUNK_BITS = 12
+
+
+class Symmetry:
+    """
+    Reflection of the states about the main diagonal which keeps a goal in place.
+    The reflection of a state moves the tile of cell (row, col) to cell (col, row) and relabels it with
+    the goal's tile of its new cell, i.e. the tile `t` becomes `tiles[t]`. Every goal with the blank on the
+    main diagonal has such a symmetry. Moves are reflected to moves and the goal to itself, so a state and
+    its reflection have the same distance to the goal, and the smaller of the two packed states is the
+    canonical representative of both.
+    The distance from a start state is not kept by the reflection, but a search from it to the goal may still
+    keep one node for a state and its reflection, see `EightPuzzle.reflection()`.
+
+    Attributes:
+
+        board:
+            the board of the puzzle
+
+        cells:
+            tuple where `cells[cell]` is the reflected cell
+
+        tiles:
+            tuple where `tiles[tile]` is the label of the reflected tile
+
+        chunks:
+            tuple of (shift, lookup table) for each chunk of whole cells of the packed state, where the table
+            maps the bits of the chunk to their reflection, so `reflect` is a lookup per chunk
+    """
+
+    _instances: Dict[Tuple[int, int], 'Symmetry'] = dict()
+
+    def __init__(self, board, goal):
+
+        self.board: Board = board
+
+        goal_tiles = board.tiles(goal)
+        self.cells: Tuple[int, ...] = tuple((cell % board.size) * board.size + cell // board.size
+                                            for cell in range(board.n_cells))
+
+        tiles = [0] * board.n_cells
+        for cell, tile in enumerate(goal_tiles):
+            tiles[tile] = goal_tiles[self.cells[cell]]
+
+        self.tiles: Tuple[int, ...] = tuple(tiles)
+
+        cells_per_chunk = max(1, CHUNK_BITS // board.bits)
+        chunks = []
+
+        for first in range(0, board.n_cells, cells_per_chunk):
+
+            chunk_cells = range(first, min(first + cells_per_chunk, board.n_cells))
+            table = [0] * (1 << (len(chunk_cells) * board.bits))
+
+            for value in range(len(table)):
+                for i, cell in enumerate(chunk_cells):
+                    tile = (value >> (i * board.bits)) & board.mask
+                    if tile < board.n_cells:
+                        table[value] |= self.tiles[tile] << board.shifts[self.cells[cell]]
+
+            chunks.append((board.shifts[first], table))
+
+        self.chunks: Tuple[Tuple[int, list], ...] = tuple(chunks)
+        self._chunk_mask = (1 << (cells_per_chunk * board.bits)) - 1
+
+    @classmethod
+    def of(cls, board: Board, goal: int) -> Optional['Symmetry']:
+        """
+        Get the symmetry of a goal
+        :param board: the board of the puzzle
+        :param goal: the packed goal state
+        :return: Symmetry object, or None if the goal's blank is not on the main diagonal
+        """
+
+        row, col = divmod(board.blank(goal), board.size)
+
+        if row != col:
+            return None
+
+        try:
+            return cls._instances[board.size, goal]
+
+        except KeyError:
+            symmetry = cls._instances[board.size, goal] = cls(board, goal)
+            return symmetry
+
+    def reflect(self, state: int) -> int:
+        """
+        Reflect a state
+        :param state: packed state
+        :return: the packed reflected state
+        """
+
+        mask = self._chunk_mask
+
+        return sum(table[(state >> shift) & mask] for shift, table in self.chunks)
+
+    def canonical(self, state: int) -> int:
+        """
+        Get the canonical representative of a state
+        :param state: packed state
+        :return: the smaller of the state and its reflection
+        """
+
+        return min(state, self.reflect(state))
+
+    def reflect_pattern(self, pattern) -> Tuple[int, ...]:
+        """
+        Reflect a pattern of tiles
+        :param pattern: sequence of tiles
+        :return: tuple with the labels of the reflected tiles, in the same order
+        """
+
+        return tuple(self.tiles[tile] for tile in pattern)
+
+    def reflect_array(self, states: np.ndarray) -> np.ndarray:
+        """
+        Vectorised `reflect`
+        :param states: uint64 ndarray of packed states
+        :return: uint64 ndarray of the reflected states
+        """
+
+        shifts = np.array(self.board.shifts, dtype=np.uint64)
+        tiles = np.array(self.tiles, dtype=np.uint64)[tiles_array(self.board, states)]
+
+        # The tile of cell c moves to cells[c]
+        return np.bitwise_or.reduce(tiles << shifts[list(self.cells)][None, :], axis=1)
+
+    def canonical_array(self, states: np.ndarray) -> np.ndarray:
+        """
+        Vectorised `canonical`
+        :param states: uint64 ndarray of packed states
+        :return: uint64 ndarray of the canonical states
+        """
+
+        return np.minimum(states, self.reflect_array(states))
@@ -0,0 +1,136 @@
+"""
+
+Script for solving many puzzles in parallel.
+The puzzles are split into chunks which are dispatched to a pool of processes, the results are
+streamed back in completion order. Heuristics with tables on the disk (pattern databases, the
+distance oracle) are built once before the pool starts, and each worker memory-maps them, so
+all the workers share a single read-only copy.
+
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import time
+from .Board import Board
+from .DistanceOracle import ORACLE
+from .EightPuzzle import EightPuzzle
+from .PatternDatabase import prepare_tables
+
+# The configuration of the worker process, set by the pool's initializer
+_worker = dict()
+
+
+class BatchResult:
+    """
+    Class representing the result of a single puzzle in a batch.
+
+    Attributes:
+
+        index:
+            the index of the puzzle in the given states
+
+        status:
+            'solved', 'unsolvable' or 'timeout'
+
+        solution:
+            list of tables from the init state to the goal state, None if not solved
+
+        run_time:
+            the solve time in seconds
+    """
+
+    def __init__(self, index, status, solution, run_time):
+
+        self.index: int = index
+        self.status: str = status
+        self.solution = solution
+        self.run_time: float = run_time
+
+    @property
+    def length(self):
+        """
+        The number of moves in the solution, None if not solved
+        """
+
+        return None if self.solution is None else len(self.solution) - 1
+
+    def __str__(self):
+
+        return 'Index: {}, Status: {}, Length: {}, Run Time: {:.4f}'.format(self.index, self.status,
+                                                                             self.length, self.run_time)
+
+
+def _init_worker(goal_state, algorithm, h_function, search_type, time_limit):
+
+    _worker.update(goal_state=goal_state, algorithm=algorithm, h_function=h_function,
+                   search_type=search_type, time_limit=time_limit)
+
+
+def _solve_chunk(chunk):
+    """
+    Solve a chunk of puzzles in the worker process
+    :param chunk: list of (index, init table)
+    :return: list of BatchResult
+    """
+
+    results = []
+
+    for index, init_state in chunk:
+
+        start = time()
+        puzzle = EightPuzzle(init_state, _worker['goal_state'])
+
+        try:
+            solution = puzzle.solve(_worker['algorithm'], _worker['h_function'], _worker['search_type'],
+                                    verbose=False, time_limit=_worker['time_limit'])
+
+        except TimeoutError:
+            results.append(BatchResult(index, 'timeout', None, time() - start))
+            continue
+
+        if solution is None:
+            results.append(BatchResult(index, 'unsolvable', None, time() - start))
+
+        else:
+            results.append(BatchResult(index, 'solved', [node.table for node in solution], time() - start))
+
+    return results
+
+
+def solve_many(states, algorithm, h_function, goal_state=None, workers=None, chunk_size=16,
+               time_limit=None, search_type='dfs'):
+    """
+    Solve many puzzles across a pool of processes.
+    :param states: iterable of init tables, all with the same size
+    :param algorithm: str, algorithm name as in `EightPuzzle.solve()`
+    :param h_function: heuristic function or heuristic object, must be picklable
+    :param goal_state: goal table, by default `EightPuzzle.goal_table()` of the states' size
+    :param workers: int, number of processes, by default the number of CPUs
+    :param chunk_size: int, number of puzzles sent to a process at once
+    :param time_limit: float, seconds per puzzle, optional
+    :param search_type: str, search type if using B&B
+    :return: iterator of BatchResult, in completion order
+    """
+
+    states = list(states)
+
+    if len(states) == 0:
+        return
+
+    board = Board.of(len(states[0]))
+
+    if goal_state is None:
+        goal_state = EightPuzzle.goal_table(board.size)
+
+    prepare_tables(ORACLE if algorithm.lower() == 'oracle' else h_function, board, goal_state)
+
+    indexed = list(enumerate(states))
+    chunks = [indexed[i:i + chunk_size] for i in range(0, len(indexed), chunk_size)]
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker,
+                             initargs=(goal_state, algorithm, h_function, search_type, time_limit)) as executor:
+
+        futures = [executor.submit(_solve_chunk, chunk) for chunk in chunks]
+
+        for future in as_completed(futures):
+            yield from future.result()
@@ -0,0 +1,171 @@
+"""
+
+Script for the workers of Hash-Distributed A* (HDA*), see `EightPuzzle.hda_star_solve()`.
+Each state is owned by a single worker process, chosen by a hash of the state. A worker keeps the open
+list and the g values of its own states only. The children of an expanded state are buffered per owner
+and sent in batches to the owners' inboxes, children which the worker owns are pushed directly.
+The workers prune nodes which their f value is not smaller than the incumbent (the cost of the best
+solution found), so once all the workers are idle and no batch is in transit the incumbent is optimal.
+The termination is detected by the coordinator with the four-counter method: waves of probes collect
+the number of batches each worker sent and received, and the search is over when two consecutive waves
+find all the workers idle with the same totals, which are equal.
+
+"""
+
+import heapq
+import numpy as np
+from queue import Empty
+from .Board import Board
+from .SearchStats import SearchStats, TimedHeuristic
+from .heuristics import compile_heuristic
+
+# Number of expansions between two flushes of the outgoing batches
+BATCH_EXPANSIONS = 64
+
+# Constant of Fibonacci hashing, spread the states over the workers
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+HASH_MASK = (1 << 64) - 1
+
+
+def owner(state: int, workers: int) -> int:
+    """
+    The worker which owns a state
+    :param state: packed state
+    :param workers: int, number of workers
+    :return: the index of the worker
+    """
+
+    return (((hash(state) * HASH_MULTIPLIER) & HASH_MASK) >> 32) % workers
+
+
+def run_worker(index, size, goal_table, h_function, inboxes, results, profile=False):
+    """
+    The main loop of a worker process.
+    The inbox gets ('nodes', batch) with (state, g, h, parent, blank) entries, ('incumbent', cost),
+    ('probe', wave), ('trace', state) and ('stop',). The results queue gets ('goal', cost), ('parent', state,
+    parent, blank) and ('status', wave, index, idle, sent, received, open list length, stats), where the
+    stats are the worker's SearchStats.
+    :param index: int, the index of this worker
+    :param size: int, the width of the board
+    :param goal_table: goal state table, ndarray
+    :param h_function: heuristic function or heuristic object
+    :param inboxes: list with the inbox queue of each worker
+    :param results: the queue of the coordinator
+    :param profile: bool, if to measure the time of the heuristic and of the open list operations
+    :return:
+    """
+
+    board = Board.of(size)
+    goal = board.pack(goal_table)
+    stats = SearchStats(profile)
+    h = compile_heuristic(h_function, board, goal_table)
+    if profile:
+        h = TimedHeuristic(h, stats)
+
+    workers = len(inboxes)
+
+    open_list = []
+    g_values = dict()
+    parents = dict()
+    incumbent = np.inf
+    sent = received = 0
+    outboxes = [[] for _ in range(workers)]
+    heappush, heappop = stats.timed(heapq.heappush), stats.timed(heapq.heappop)
+
+    def push(state, g_value, h_value, parent, blank):
+
+        if g_value >= g_values.get(state, np.inf):
+            stats.duplicates += 1
+
+        elif g_value + h_value >= incumbent:
+            stats.pruned += 1
+
+        else:
+            g_values[state] = g_value
+            parents[state] = (parent, blank)
+            heappush(open_list, (g_value + h_value, h_value, g_value, state, blank))
+            stats.frontier(len(open_list))
+
+    def flush():
+        nonlocal sent
+
+        for worker, batch in enumerate(outboxes):
+            if len(batch) > 0:
+                inboxes[worker].put(('nodes', batch))
+                outboxes[worker] = []
+                sent += 1
+
+    def idle():
+
+        # Drop the nodes which can't improve the incumbent, or were reached again with a better g value
+        while len(open_list) > 0 and (open_list[0][0] >= incumbent or open_list[0][2] > g_values[open_list[0][3]]):
+            heappop(open_list)
+
+        return len(open_list) == 0
+
+    while True:
+
+        # Handle the messages, wait for them only if there is nothing to expand
+        while True:
+
+            try:
+                message = inboxes[index].get(block=idle())
+
+            except Empty:
+                break
+
+            if message[0] == 'nodes':
+                received += 1
+                for node in message[1]:
+                    push(*node)
+
+            elif message[0] == 'incumbent':
+                incumbent = min(incumbent, message[1])
+
+            elif message[0] == 'probe':
+                stats.estimate_bytes((0, 0, 0, goal, 0), g_values, parents)
+                results.put(('status', message[1], index, idle(), sent, received, len(open_list), stats))
+
+            elif message[0] == 'trace':
+                results.put(('parent', message[1]) + parents[message[1]])
+
+            elif message[0] == 'stop':
+
+                # Exit without waiting for the batches which the other workers won't read
+                for queue in inboxes + [results]:
+                    queue.cancel_join_thread()
+
+                return
+
+        # Expand a batch of nodes
+        for _ in range(BATCH_EXPANSIONS):
+
+            if idle():
+                break
+
+            f_value, h_value, g_value, state, blank = heappop(open_list)
+            stats.expanded += 1
+
+            if state == goal:
+                incumbent = g_value
+                results.put(('goal', g_value))
+                continue
+
+            stats.generated += len(board.moves[blank])
+            for cell in board.moves[blank]:
+
+                child = board.slide(state, blank, cell)
+                child_h = h.update(h_value, state, blank, cell, child)
+
+                if g_value + 1 + child_h >= incumbent:
+                    stats.pruned += 1
+                    continue
+
+                worker = owner(child, workers)
+                if worker == index:
+                    push(child, g_value + 1, child_h, state, cell)
+
+                else:
+                    outboxes[worker].append((child, g_value + 1, child_h, state, cell))
+
+        flush()
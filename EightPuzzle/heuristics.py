@@ -4,23 +4,34 @@ Script for all the heuristics functions
 Each function need to get the current table and the goal table.
 The heuristic return the h value as int or float.
 
+The solvers use the compiled version of the heuristics (`Heuristic` classes below), which are
+compiled once for the goal state and evaluated on packed states.
+
 """
 
 import numpy as np
+from collections import deque, OrderedDict
+from .Board import Board
+
+# Largest board which its walking distance tables fit in memory (5x5 has billions of abstract states)
+MAX_WALKING_DISTANCE_SIZE = 4
+
+# Maximal number of compiled heuristics kept in the cache
+MAX_COMPILED = 64
 
 
 def h_manhattan(table, goal_table):
     """
     This h function calculate the sum of manhattan distance between current table
     to the goal table.
-    :param table: current table, ndarray with shape (3,3)
-    :param goal_table: gaol state table, ndarray with shape (3,3)
+    :param table: current table, ndarray with shape (size, size)
+    :param goal_table: gaol state table, ndarray with shape (size, size)
     :return:
     """
 
     manhattan_sum = 0
 
-    for i in range(1, 9):
+    for i in range(1, table.size):
         # Get position on current table
         table_pos = np.where(table == i)
 
@@ -49,7 +60,7 @@ def h_misplaced(table, goal_table):
 
     misplaced = 0
 
-    for i in range(1, 9):
+    for i in range(1, len(table)):
         # if the i number is misplaced
         if goal_table.index(i) != table.index(i):
             misplaced += 1
@@ -61,14 +72,14 @@ def h_euclidean(table, goal_table):
     """
     This h function calculate the sum of euclidean distance between current table
     to the goal table.
-    :param table: current table, ndarray with shape (3,3)
-    :param goal_table: gaol state table, ndarray with shape (3,3)
+    :param table: current table, ndarray with shape (size, size)
+    :param goal_table: gaol state table, ndarray with shape (size, size)
     :return:
     """
 
     euclidean_sum = 0
 
-    for i in range(1, 9):
+    for i in range(1, table.size):
         # Get position on current table
         table_pos = np.where(table == i)
 
@@ -83,3 +94,541 @@ def h_euclidean(table, goal_table):
     return euclidean_sum
 
 
+def h_linear_conflict(table, goal_table):
+    """
+    h function which add to the manhattan distance 2 moves for each tile which must leave its
+    row (column) to let other tiles of that row (column) pass it
+    :param table: current table, ndarray
+    :param goal_table: gaol state table, ndarray
+    :return: the h value, int
+    """
+
+    board = Board.of(len(table))
+
+    # The tables are compiled once per goal and cached
+    return compile_heuristic(h_linear_conflict, board, goal_table)(board.pack(table))
+
+
+def h_walking_distance(table, goal_table):
+    """
+    h function which sum the vertical and horizontal walking distance. The vertical walking distance
+    is the number of vertical moves needed to bring each tile to its goal row, where a tile can only
+    move into the blank row, the horizontal walking distance is the same for columns
+    :param table: current table, ndarray
+    :param goal_table: gaol state table, ndarray
+    :return: the h value, int
+    """
+
+    board = Board.of(len(table))
+
+    # The tables are compiled once per goal and cached
+    return compile_heuristic(h_walking_distance, board, goal_table)(board.pack(table))
+
+
+class Heuristic:
+    """
+    Base class for heuristics compiled for a specific board and goal state.
+    A compiled heuristic get a packed state and return the h value. Additionally, it can compute
+    the h value of a child from the h value of its parent (`update`), since a move changes
+    the position of a single tile.
+
+    Attributes:
+
+        board:
+            the board of the puzzle
+
+        goal_table:
+            goal state table, ndarray
+
+        goal_cells:
+            list where goal_cells[tile] is the cell of the tile in the goal state
+
+        integral:
+            if the h values are ints
+    """
+
+    integral = True
+
+    def __init__(self, board, goal_table):
+
+        self.board = board
+        self.goal_table = goal_table
+        self.goal_cells = [0] * board.n_cells
+
+        for cell, tile in enumerate(board.tiles(board.pack(goal_table))):
+            self.goal_cells[tile] = cell
+
+    def __call__(self, state):
+
+        raise NotImplementedError
+
+    def update(self, h, state, blank, cell, child):
+        """
+        Compute the h value of a child, by default the child is evaluated from scratch
+        :param h: the h value of the parent
+        :param state: the packed parent state
+        :param blank: the blank cell in the parent
+        :param cell: the cell of the moved tile in the parent, i.e. the blank cell in the child
+        :param child: the packed child state
+        :return: the h value of the child
+        """
+
+        return self(child)
+
+
+class TableHeuristic(Heuristic):
+    """
+    Heuristic function which get the current table and the goal table, evaluated on the unpacked state
+    """
+
+    integral = False
+
+    def __init__(self, board, goal_table, h_function):
+
+        super().__init__(board, goal_table)
+        self.h_function = h_function
+
+    def __call__(self, state):
+
+        return self.h_function(self.board.unpack(state), self.goal_table)
+
+
+class RelabelledHeuristic(Heuristic):
+    """
+    Heuristic to another target state, evaluated by a heuristic compiled for the goal so its tables are reused.
+    Renaming the tiles of all the states by the same permutation keeps the distances between them, so with
+    `labels` mapping each tile of the target to the tile of the goal in the same cell, d(s, target) is
+    d(relabel(s), goal). The blank can't be renamed, so if the blanks of the target and the goal are in
+    different cells the target is replaced by the anchor - the target with its blank slid `offset` moves
+    to the goal's blank cell - and d(s, target) >= d(s, anchor) - offset.
+
+    Attributes:
+
+        heuristic:
+            the heuristic compiled for the goal
+
+        labels:
+            list where labels[tile] is the tile of the goal in the cell of the tile in the anchor
+
+        offset:
+            the number of moves from the target to the anchor
+    """
+
+    def __init__(self, heuristic, board, goal_table, target_table):
+
+        super().__init__(board, target_table)
+
+        self.heuristic = heuristic
+        self.integral = heuristic.integral
+
+        goal = board.pack(goal_table)
+        goal_row, goal_col = divmod(board.blank(goal), board.size)
+
+        # Slide the target's blank along its row and then along the goal's blank column
+        anchor = board.pack(target_table)
+        blank = board.blank(anchor)
+        self.offset = 0
+
+        while blank != board.blank(goal):
+            row, col = divmod(blank, board.size)
+            cell = blank + (np.sign(goal_col - col) if col != goal_col else board.size * np.sign(goal_row - row))
+            anchor = board.slide(anchor, blank, int(cell))
+            blank = int(cell)
+            self.offset += 1
+
+        self.labels = [0] * board.n_cells
+        for tile, goal_tile in zip(board.tiles(anchor), board.tiles(goal)):
+            self.labels[tile] = goal_tile
+
+        # The last relabelled parent, all its children are updated one after the other
+        self._parent = (None, None)
+
+    def relabel(self, state):
+        """
+        Rename the tiles of a state
+        :param state: packed state
+        :return: the packed relabelled state
+        """
+
+        if self._parent[0] == state:
+            return self._parent[1]
+
+        board = self.board
+        labels = self.labels
+        relabelled = sum(labels[tile] << shift for tile, shift in zip(board.tiles(state), board.shifts))
+        self._parent = (state, relabelled)
+
+        return relabelled
+
+    def __call__(self, state):
+
+        return max(self.heuristic(self.relabel(state)) - self.offset, 0)
+
+    def update(self, h, state, blank, cell, child):
+
+        # The h value of the parent is known only if it was not clipped to 0
+        if h == 0 and self.offset > 0:
+            return self(child)
+
+        parent = self.relabel(state)
+        h = self.heuristic.update(h + self.offset, parent, blank, cell, self.board.slide(parent, blank, cell))
+
+        return max(h - self.offset, 0)
+
+
+class TileHeuristic(Heuristic):
+    """
+    Base class for heuristics which are a sum of a cost per tile according to its cell.
+    The costs and the change of the cost for each move are compiled into flat lookup tables,
+    so the update after a move is a single lookup.
+    """
+
+    def __init__(self, board, goal_table):
+
+        super().__init__(board, goal_table)
+
+        n = board.n_cells
+        goal_cells = self.goal_cells
+
+        # costs[tile * n + cell], the blank has no cost
+        self.costs = [0] * (n * n)
+        for tile in range(1, n):
+            for cell in range(n):
+                self.costs[tile * n + cell] = self.tile_cost(cell, goal_cells[tile])
+
+        # deltas[(tile * n + src) * n + dst], the change of the cost when the tile move from src to dst
+        self.deltas = [0] * (n * n * n)
+        for tile in range(1, n):
+            for src in range(n):
+                for dst in board.moves[src]:
+                    self.deltas[(tile * n + src) * n + dst] = self.costs[tile * n + dst] - self.costs[tile * n + src]
+
+    def tile_cost(self, cell, goal_cell):
+        """
+        The cost of a tile placed in a cell
+        :param cell: the cell of the tile
+        :param goal_cell: the cell of the tile in the goal state
+        :return: the cost
+        """
+
+        raise NotImplementedError
+
+    def __call__(self, state):
+
+        n = self.board.n_cells
+        costs = self.costs
+
+        return sum(costs[tile * n + cell] for cell, tile in enumerate(self.board.tiles(state)))
+
+    def update(self, h, state, blank, cell, child):
+
+        board = self.board
+        tile = (state >> board.shifts[cell]) & board.mask
+
+        return h + self.deltas[(tile * board.n_cells + cell) * board.n_cells + blank]
+
+
+class ManhattanHeuristic(TileHeuristic):
+
+    def tile_cost(self, cell, goal_cell):
+
+        row, col = divmod(cell, self.board.size)
+        goal_row, goal_col = divmod(goal_cell, self.board.size)
+
+        return abs(row - goal_row) + abs(col - goal_col)
+
+
+class MisplacedHeuristic(TileHeuristic):
+
+    def tile_cost(self, cell, goal_cell):
+
+        return int(cell != goal_cell)
+
+
+class EuclideanHeuristic(TileHeuristic):
+
+    integral = False
+
+    def tile_cost(self, cell, goal_cell):
+
+        row, col = divmod(cell, self.board.size)
+        goal_row, goal_col = divmod(goal_cell, self.board.size)
+
+        return np.sqrt((row - goal_row) ** 2 + (col - goal_col) ** 2)
+
+
+class LinearConflictHeuristic(ManhattanHeuristic):
+    """
+    Manhattan distance plus the linear conflicts of each row and column.
+    The content of a line is encoded as a key in base (size + 1), where each cell holds the goal
+    position of its tile inside the line or `size` if the tile doesn't belong to the line. The extra
+    moves of every possible key are precomputed, so a line is evaluated by summing `size` lookups.
+    """
+
+    def __init__(self, board, goal_table):
+
+        super().__init__(board, goal_table)
+
+        n, size = board.n_cells, board.size
+        radix = size + 1
+
+        self.rows = [tuple(range(r * size, (r + 1) * size)) for r in range(size)]
+        self.cols = [tuple(range(c, n, size)) for c in range(size)]
+        self.conflicts = line_conflicts(size)
+
+        # row_parts[tile * n + cell], the part of the key of the row of the cell, same for columns
+        self.row_parts = [0] * (n * n)
+        self.col_parts = [0] * (n * n)
+
+        for tile in range(n):
+
+            goal_row, goal_col = divmod(self.goal_cells[tile], size)
+
+            for cell in range(n):
+
+                row, col = divmod(cell, size)
+                in_row = (tile != 0) & (goal_row == row)
+                in_col = (tile != 0) & (goal_col == col)
+
+                self.row_parts[tile * n + cell] = (goal_col if in_row else size) * radix ** col
+                self.col_parts[tile * n + cell] = (goal_row if in_col else size) * radix ** row
+
+    def line(self, state, cells, parts):
+        """
+        Get the extra moves of a single line
+        :param state: packed state
+        :param cells: the cells of the line
+        :param parts: the key parts of the line type (rows or columns)
+        :return: the extra moves
+        """
+
+        board = self.board
+        n = board.n_cells
+
+        return self.conflicts[sum(parts[((state >> board.shifts[cell]) & board.mask) * n + cell] for cell in cells)]
+
+    def __call__(self, state):
+
+        h = super().__call__(state)
+
+        for row in self.rows:
+            h += self.line(state, row, self.row_parts)
+
+        for col in self.cols:
+            h += self.line(state, col, self.col_parts)
+
+        return h
+
+    def update(self, h, state, blank, cell, child):
+
+        h = super().update(h, state, blank, cell, child)
+
+        size = self.board.size
+        row, col = divmod(cell, size)
+        blank_row, blank_col = divmod(blank, size)
+
+        # Horizontal move change the tile's row and both columns, vertical move the opposite
+        if row == blank_row:
+            lines = [(self.rows[row], self.row_parts), (self.cols[col], self.col_parts),
+                     (self.cols[blank_col], self.col_parts)]
+        else:
+            lines = [(self.cols[col], self.col_parts), (self.rows[row], self.row_parts),
+                     (self.rows[blank_row], self.row_parts)]
+
+        for cells, parts in lines:
+            h += self.line(child, cells, parts) - self.line(state, cells, parts)
+
+        return h
+
+
+class WalkingDistanceHeuristic(Heuristic):
+    """
+    Walking distance heuristic. A state is abstracted to a matrix counting, for each row, the tiles
+    which their goal row is each row, and the row of the blank. The distance of each abstract state
+    is precomputed by BFS, the horizontal distance use the same table over the columns.
+    """
+
+    def __init__(self, board, goal_table):
+
+        if board.size > MAX_WALKING_DISTANCE_SIZE:
+            raise NotImplementedError('The walking distance is available only up to {0}x{0} boards'.format(
+                MAX_WALKING_DISTANCE_SIZE))
+
+        super().__init__(board, goal_table)
+
+        n, size = board.n_cells, board.size
+        radix = size + 1
+        goal_row, goal_col = divmod(self.goal_cells[0], size)
+
+        self.vertical = walking_distances(size, goal_row)
+        self.horizontal = walking_distances(size, goal_col)
+
+        # vertical_parts[tile * n + cell], the part of the matrix key of the tile, same for horizontal
+        self.vertical_parts = [0] * (n * n)
+        self.horizontal_parts = [0] * (n * n)
+
+        for tile in range(1, n):
+
+            tile_row, tile_col = divmod(self.goal_cells[tile], size)
+
+            for cell in range(n):
+
+                row, col = divmod(cell, size)
+                self.vertical_parts[tile * n + cell] = radix ** (row * size + tile_row)
+                self.horizontal_parts[tile * n + cell] = radix ** (col * size + tile_col)
+
+    def __call__(self, state):
+
+        n, size = self.board.n_cells, self.board.size
+        tiles = self.board.tiles(state)
+        blank = tiles.index(0)
+
+        vertical = sum(self.vertical_parts[tile * n + cell] for cell, tile in enumerate(tiles))
+        horizontal = sum(self.horizontal_parts[tile * n + cell] for cell, tile in enumerate(tiles))
+
+        return self.vertical[vertical * size + blank // size] + self.horizontal[horizontal * size + blank % size]
+
+
+# The compiled version of each heuristic function
+COMPILED_HEURISTICS = {h_manhattan: ManhattanHeuristic,
+                       h_misplaced: MisplacedHeuristic,
+                       h_euclidean: EuclideanHeuristic,
+                       h_linear_conflict: LinearConflictHeuristic,
+                       h_walking_distance: WalkingDistanceHeuristic}
+
+# Caches of the tables shared by all the goals with the same board size
+_LINE_CONFLICTS = dict()
+_WALKING_DISTANCES = dict()
+
+# LRU cache of the compiled heuristics, {(heuristic function, size, goal): Heuristic object}
+_COMPILED = OrderedDict()
+
+
+def line_conflicts(size):
+    """
+    Compute the extra moves of each possible line for the linear conflict heuristic.
+    A line's tiles which are not part of the longest increasing subsequence of goal positions
+    must leave the line and come back, 2 extra moves each.
+    :param size: the width of the board
+    :return: list indexed by the line's key
+    """
+
+    try:
+        return _LINE_CONFLICTS[size]
+
+    except KeyError:
+        pass
+
+    radix = size + 1
+    conflicts = [0] * (radix ** size)
+
+    for key in range(len(conflicts)):
+
+        # Goal positions of the tiles which belong to the line, in their current order
+        positions = []
+        for i in range(size):
+            digit = key // radix ** i % radix
+            if digit < size:
+                positions.append(digit)
+
+        # Longest increasing subsequence, lines are short so O(k^2) is enough
+        longest = [1] * len(positions)
+        for i in range(len(positions)):
+            for j in range(i):
+                if positions[j] < positions[i]:
+                    longest[i] = max(longest[i], longest[j] + 1)
+
+        conflicts[key] = 2 * (len(positions) - max(longest, default=0))
+
+    _LINE_CONFLICTS[size] = conflicts
+
+    return conflicts
+
+
+def walking_distances(size, blank_line):
+    """
+    Compute the walking distance of each abstract state by BFS from the goal's abstract state.
+    The abstract state is a (size x size) matrix where matrix[line][group] count the tiles in
+    the line which belong to the group's line in the goal, and the line of the blank.
+    :param size: the width of the board
+    :param blank_line: the line of the blank in the goal
+    :return: dict with {matrix key * size + blank line: distance}
+    """
+
+    try:
+        return _WALKING_DISTANCES[size, blank_line]
+
+    except KeyError:
+        pass
+
+    radix = size + 1
+    weights = [[radix ** (line * size + group) for group in range(size)] for line in range(size)]
+
+    # In the goal each line hold its own tiles, the blank's line is missing one tile
+    goal_counts = [[(size - (line == blank_line)) if line == group else 0 for group in range(size)]
+                   for line in range(size)]
+    goal_key = sum(weights[line][group] * goal_counts[line][group] for line in range(size) for group in range(size))
+
+    distances = {goal_key * size + blank_line: 0}
+    queue = deque([(goal_key, blank_line)])
+
+    while len(queue) > 0:
+
+        key, blank = queue.popleft()
+        distance = distances[key * size + blank]
+
+        for line in (blank - 1, blank + 1):
+
+            if not 0 <= line < size:
+                continue
+
+            # Move a tile of any group from the adjacent line into the blank line
+            for group in range(size):
+
+                if key // weights[line][group] % radix == 0:
+                    continue
+
+                child = key - weights[line][group] + weights[blank][group]
+
+                if child * size + line not in distances:
+                    distances[child * size + line] = distance + 1
+                    queue.append((child, line))
+
+    _WALKING_DISTANCES[size, blank_line] = distances
+
+    return distances
+
+
+def compile_heuristic(h_function, board, goal_table):
+    """
+    Compile a heuristic for a given board and goal state. The compiled versions of the heuristic functions
+    are read-only, so they are cached and shared by all the puzzles with the same goal.
+    :param h_function: heuristic function which get current table and goal table,
+                        or an object with `compile(board, goal_table)` method (e.g. pattern databases)
+    :param board: the board of the puzzle
+    :param goal_table: goal state table, ndarray
+    :return: Heuristic object
+    """
+
+    if h_function in COMPILED_HEURISTICS:
+
+        key = (h_function, board.size, board.pack(goal_table))
+
+        try:
+            _COMPILED.move_to_end(key)
+            return _COMPILED[key]
+
+        except KeyError:
+            pass
+
+        compiled = _COMPILED[key] = COMPILED_HEURISTICS[h_function](board, goal_table)
+
+        while len(_COMPILED) > MAX_COMPILED:
+            _COMPILED.popitem(last=False)
+
+        return compiled
+
+    if hasattr(h_function, 'compile'):
+        return h_function.compile(board, goal_table)
+
+    return TableHeuristic(board, goal_table, h_function)
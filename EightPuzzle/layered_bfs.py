@@ -0,0 +1,156 @@
+"""
+
+Script for Breadth-First search which expand a whole layer at once with numpy.
+Each layer is a sorted uint64 ndarray of packed states, so it works for boards up to 4x4.
+The children of a layer are computed with vectorised blank-move arithmetic, and since the state
+graph is bipartite, the new layer is the children which are not in the previous layer.
+
+"""
+
+import numpy as np
+from .Board import Board
+
+
+def check_board(board: Board):
+    """
+    Make sure the packed states of the board fit in uint64
+    :param board: the board of the puzzle
+    :return:
+    """
+
+    if board.n_cells * board.bits > 64:
+        raise NotImplementedError('Layered BFS supports boards which their packed state fits in 64 bits')
+
+
+def tiles_array(board: Board, states: np.ndarray) -> np.ndarray:
+    """
+    Unpack an array of states
+    :param board: the board of the puzzle
+    :param states: uint64 ndarray of packed states, shape (m,)
+    :return: ndarray with shape (m, n_cells) with the tile of each cell
+    """
+
+    shifts = np.array(board.shifts, dtype=np.uint64)
+
+    return ((states[:, None] >> shifts[None, :]) & np.uint64(board.mask)).astype(np.int64)
+
+
+def count_children(board: Board, states: np.ndarray) -> int:
+    """
+    Count the children of an array of states (before removing the duplicates)
+    :param board: the board of the puzzle
+    :param states: uint64 ndarray of packed states
+    :return: int
+    """
+
+    n_moves = np.array([len(moves) for moves in board.moves])
+
+    return int(n_moves[np.argmin(tiles_array(board, states), axis=1)].sum())
+
+
+def expand(board: Board, states: np.ndarray) -> np.ndarray:
+    """
+    Compute all the children of an array of states
+    :param board: the board of the puzzle
+    :param states: uint64 ndarray of packed states
+    :return: sorted uint64 ndarray with the unique children
+    """
+
+    blanks = np.argmin(tiles_array(board, states), axis=1)
+    shifts = np.array(board.shifts, dtype=np.uint64)
+    cell_mask = np.uint64(board.mask)
+    children = []
+
+    # The k-th move of each blank cell, -1 where the blank has less than k + 1 moves
+    for k in range(4):
+
+        targets = np.array([moves[k] if k < len(moves) else -1 for moves in board.moves])[blanks]
+        valid = targets >= 0
+
+        parents = states[valid]
+        blank_shifts = shifts[blanks[valid]]
+        cell_shifts = shifts[targets[valid]]
+
+        # Slide the tile into the blank, the blank is 0 so only the tile's bits move
+        tiles = (parents >> cell_shifts) & cell_mask
+        children.append(parents - (tiles << cell_shifts) + (tiles << blank_shifts))
+
+    return np.unique(np.concatenate(children))
+
+
+def bfs_layers(board: Board, root: int, max_depth=None, symmetry=None):
+    """
+    Breadth-First search from a state, layer by layer
+    :param board: the board of the puzzle
+    :param root: the packed root state
+    :param max_depth: int, the last layer to yield, optional (by default the whole reachable space)
+    :param symmetry: Symmetry which keeps the root in place, optional. The layers hold only the canonical
+                     states, a state and its reflection are in the same layer
+    :return: iterator of the layers, each layer is a sorted uint64 ndarray of packed states
+    """
+
+    check_board(board)
+
+    if (symmetry is not None) and (symmetry.reflect(root) != root):
+        raise ValueError('The symmetry must keep the root in place')
+
+    previous = np.array([], dtype=np.uint64)
+    layer = np.array([root], dtype=np.uint64)
+    depth = 0
+
+    while len(layer) > 0:
+
+        yield layer
+
+        if (max_depth is not None) and (depth >= max_depth):
+            return
+
+        children = expand(board, layer)
+        if symmetry is not None:
+            children = np.unique(symmetry.canonical_array(children))
+
+        # The neighbours of a layer are in the previous layer or in the next one
+        previous, layer = layer, np.setdiff1d(children, previous, assume_unique=True)
+        depth += 1
+
+
+def contains(layer: np.ndarray, state: int) -> bool:
+    """
+    Check if a sorted layer contains a state
+    :param layer: sorted uint64 ndarray
+    :param state: packed state
+    :return: bool answer
+    """
+
+    index = np.searchsorted(layer, np.uint64(state))
+
+    return index < len(layer) and layer[index] == state
+
+
+def trace_path(board: Board, layers, state: int):
+    """
+    Trace a shortest path from the root to a state in the last layer, by stepping each time to
+    a neighbour in the previous layer
+    :param board: the board of the puzzle
+    :param layers: list of the layers from the root to the state's layer
+    :param state: packed state in the last layer
+    :return: list of packed states from the root to the state
+    """
+
+    path = [state]
+
+    for layer in reversed(layers[:-1]):
+
+        blank = board.blank(state)
+
+        for cell in board.moves[blank]:
+            child = board.slide(state, blank, cell)
+            if contains(layer, child):
+                state = child
+                break
+
+        path.append(state)
+
+    path.reverse()
+
+    return path
@@ -0,0 +1,139 @@
+"""
+
+Script for ranking (partial) permutations into dense indexes, and their parity.
+A partial permutation is a sequence of k distinct values out of range(n), its rank is
+in range(partial_count(n, k)). Used for indexing the pattern databases and distance tables.
+
+"""
+
+import numpy as np
+from math import factorial
+
+
+def partial_count(n, k):
+    """
+    The number of partial permutations of k values out of n
+    :param n: int, number of possible values
+    :param k: int, length of the sequence
+    :return: int
+    """
+
+    return factorial(n) // factorial(n - k)
+
+
+def partial_rank(values, n):
+    """
+    Rank a partial permutation using its Lehmer code as mixed radix number (n, n-1, ...)
+    :param values: sequence of distinct ints in range(n)
+    :param n: int, number of possible values
+    :return: the rank as int
+    """
+
+    rank = 0
+
+    for i, value in enumerate(values):
+
+        # Count the smaller values which already used
+        digit = value
+        for j in range(i):
+            if values[j] < value:
+                digit -= 1
+
+        rank = rank * (n - i) + digit
+
+    return rank
+
+
+def partial_rank_array(values, n):
+    """
+    Vectorised `partial_rank` over the rows of an array
+    :param values: int ndarray with shape (m, k), each row is a partial permutation
+    :param n: int, number of possible values
+    :return: int64 ndarray with shape (m,)
+    """
+
+    rank = np.zeros(len(values), dtype=np.int64)
+
+    for i in range(values.shape[1]):
+        digit = values[:, i] - (values[:, :i] < values[:, i:i + 1]).sum(axis=1)
+        rank = rank * (n - i) + digit
+
+    return rank
+
+
+def partial_unrank(rank, n, k):
+    """
+    The inverse of `partial_rank`
+    :param rank: the rank as int
+    :param n: int, number of possible values
+    :param k: int, length of the sequence
+    :return: list with the values
+    """
+
+    # Extract the Lehmer digits, the last digit has the smallest radix
+    digits = []
+    for i in range(k - 1, -1, -1):
+        rank, digit = divmod(rank, n - i)
+        digits.append(digit)
+
+    digits.reverse()
+
+    # Convert each digit to the digit-th unused value
+    unused = list(range(n))
+
+    return [unused.pop(digit) for digit in digits]
+
+
+def permutation_parity(values):
+    """
+    The parity of a permutation of range(n), by its cycle decomposition in O(n)
+    :param values: sequence with a permutation of range(n)
+    :return: 0 for even permutation, 1 for odd permutation
+    """
+
+    seen = [False] * len(values)
+    parity = 0
+
+    for start in range(len(values)):
+
+        if seen[start]:
+            continue
+
+        # A cycle of length k is (k - 1) transpositions
+        length = 0
+        value = start
+        while not seen[value]:
+            seen[value] = True
+            value = values[value]
+            length += 1
+
+        parity ^= (length - 1) & 1
+
+    return parity
+
+
+def permutation_parity_array(values):
+    """
+    Vectorised `permutation_parity` over the rows of an array, by sorting each row with transpositions
+    :param values: int ndarray with shape (m, n), each row is a permutation of range(n)
+    :return: uint8 ndarray with shape (m,), 0 for even permutation, 1 for odd permutation
+    """
+
+    values = np.array(values, dtype=np.int64)
+    positions = np.argsort(values, axis=1)
+    rows = np.arange(len(values))
+    parity = np.zeros(len(values), dtype=np.uint8)
+
+    for i in range(values.shape[1]):
+
+        # Swap the value i into its place, the rows where it's already there are not changed
+        value = values[:, i].copy()
+        j = positions[:, i]
+        parity ^= (value != i).astype(np.uint8)
+
+        values[rows, j] = value
+        values[:, i] = i
+        positions[rows, value] = j
+        positions[:, i] = i
+
+    return parity
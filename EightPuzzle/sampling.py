@@ -0,0 +1,133 @@
+"""
+
+Script for sampling solvable tables in vectorised batches.
+A batch of random permutations is drawn at once, and the tables which are not solvable are fixed by
+swapping two tiles (not the blank), which flips the permutation parity. The swapped cells depend only on
+the blank's cell, so fixing is a bijection between the unsolvable and the solvable tables and the samples
+are uniform over the solvable tables. With a target depth the tables are drawn uniformly from the states
+at exactly this distance from the goal (layered BFS, for the boards the distance oracle supports), or are
+the end of random walks of this length from the goal (an upper bound on the distance) for larger boards.
+The samples are reproducible for a given seed and batch size.
+
+"""
+
+import numpy as np
+from .Board import Board
+from .DistanceOracle import MAX_ORACLE_SIZE
+from .layered_bfs import bfs_layers, tiles_array
+from .ranking import permutation_parity_array
+
+
+def solvability_parity_array(tiles: np.ndarray, size: int) -> np.ndarray:
+    """
+    Vectorised solvability invariant, see `EightPuzzle.is_solvable`
+    :param tiles: int ndarray with shape (m, n_cells), the tile of each cell
+    :param size: the width of the board
+    :return: uint8 ndarray with shape (m,)
+    """
+
+    row, col = np.divmod(np.argmin(tiles, axis=1), size)
+
+    return permutation_parity_array(tiles) ^ ((row + col) & 1).astype(np.uint8)
+
+
+def random_tables(rng, count, size, goal_table) -> np.ndarray:
+    """
+    Draw solvable tables uniformly
+    :param rng: numpy Generator
+    :param count: int, number of tables
+    :param size: the width of the board
+    :param goal_table: goal table, ndarray
+    :return: ndarray with shape (count, n_cells), the tile of each cell
+    """
+
+    n_cells = size * size
+    goal = np.asarray(goal_table).reshape((1, n_cells))
+    tiles = rng.permuted(np.tile(np.arange(n_cells), (count, 1)), axis=1)
+
+    unsolvable = np.flatnonzero(solvability_parity_array(tiles, size) != solvability_parity_array(goal, size)[0])
+
+    # Swap the tiles of the first two cells, or of the next two cells if the blank is in one of them
+    first = np.where(np.argmin(tiles[unsolvable], axis=1) < 2, 2, 0)
+    tiles[unsolvable, first], tiles[unsolvable, first + 1] = tiles[unsolvable, first + 1], tiles[unsolvable, first]
+
+    return tiles
+
+
+def random_walks(rng, count, board: Board, goal_table, depth) -> np.ndarray:
+    """
+    Walk randomly from the goal, without undoing the last move
+    :param rng: numpy Generator
+    :param count: int, number of walks
+    :param board: the board of the puzzle
+    :param goal_table: goal table, ndarray
+    :param depth: int, number of moves
+    :return: ndarray with shape (count, n_cells), the tile of each cell
+    """
+
+    rows = np.arange(count)
+    moves = np.array([moves + (-1,) * (4 - len(moves)) for moves in board.moves])
+
+    tiles = np.tile(np.asarray(goal_table).flatten(), (count, 1))
+    blanks = np.full(count, int(np.argmin(tiles[0])))
+    previous = np.full(count, -1)
+
+    for _ in range(depth):
+
+        targets = moves[blanks]
+        valid = (targets >= 0) & (targets != previous[:, None])
+
+        # Choose uniformly between the valid moves
+        choice = np.argmax(rng.random((count, 4)) * valid, axis=1)
+        cells = targets[rows, choice]
+
+        tiles[rows, blanks] = tiles[rows, cells]
+        tiles[rows, cells] = 0
+        previous, blanks = blanks, cells
+
+    return tiles
+
+
+def sample_tables(count, size=3, seed=None, goal_table=None, depth=None, batch_size=65536):
+    """
+    Sample solvable tables in batches
+    :param count: int, number of tables
+    :param size: the width of the tables
+    :param seed: seed of the random generator, optional
+    :param goal_table: goal table, optional. by default `EightPuzzle.goal_table(size)`
+    :param depth: int, the distance of the tables from the goal, optional. exact for the boards the distance
+                  oracle supports, otherwise the length of a random walk from the goal
+    :param batch_size: int, number of tables in each batch
+    :return: iterator of ndarrays with shape (batch, size, size)
+    """
+
+    board = Board.of(size)
+    rng = np.random.default_rng(seed)
+
+    if goal_table is None:
+        goal_table = np.append(np.arange(1, size * size), 0).reshape((size, size))
+
+    layer = None
+    if (depth is not None) and (size <= MAX_ORACLE_SIZE):
+
+        for layer_depth, layer in enumerate(bfs_layers(board, board.pack(goal_table), max_depth=depth)):
+            pass
+
+        if layer_depth != depth:
+            raise ValueError('There are no states at depth {}'.format(depth))
+
+    while count > 0:
+
+        batch = min(count, batch_size)
+        count -= batch
+
+        if layer is not None:
+            tiles = tiles_array(board, layer[rng.integers(len(layer), size=batch)])
+
+        elif depth is not None:
+            tiles = random_walks(rng, batch, board, goal_table, depth)
+
+        else:
+            tiles = random_tables(rng, batch, size, goal_table)
+
+        yield tiles.reshape((batch, size, size))
@@ -1,5 +1,4 @@
 import os
-import sys
 
 import numpy as np
 from pathlib import Path
@@ -11,9 +10,6 @@ import matplotlib.pyplot as plt
 # Project root directory
 root_directory = Path(__file__).parent.parent
 
-# Change recursion limit
-sys.setrecursionlimit(10**6)
-
 
 def main():
 
@@ -26,6 +22,11 @@ def main():
     n_constraints = config['environment']['n_constraints']
     n_domain = config['environment']['n_domain']
     algorithm = config['environment']['algorithm']
+    propagation = config['environment'].get('propagation')
+    backjumping = config['environment'].get('backjumping', False)
+    nogoods = config['environment'].get('nogoods', 0)
+    variable_ordering = config['environment'].get('variable_ordering')
+    value_ordering = config['environment'].get('value_ordering')
     seed = config['environment']['seed']
 
     # generate constraints
@@ -39,7 +40,7 @@ def main():
 
         bt = Backtracking(n_variables, n_domain, constraints)
 
-        solution = bt.solve()
+        solution = bt.solve(propagation, backjumping, nogoods, variable_ordering, value_ordering)
 
     # Print solution
     if solution is not None:
@@ -1,5 +1,6 @@
 import numpy as np
 from EightPuzzle.EightPuzzle import EightPuzzle
+from EightPuzzle.batch import solve_many
 import random as rnd
 from EightPuzzle.heuristics import *
 from time import time
@@ -49,23 +50,24 @@ def user_choose_solver():
     return algorithm, h_function
 
 
-def solve_puzzle():
+def solve_puzzle(size=3):
     """
     This function is an interactive 8-puzzle solver.
     The user can define a init table, or rand one.
     Then the user choose an algorithm which solve the puzzle.
     The solver return the solution and the function print it.
+    :param size: the width of the puzzle, e.g. 4 for the 15-puzzle
     :return:
     """
 
     # Init solvable table
-    init_state = EightPuzzle.init_table()
+    init_state = EightPuzzle.init_table(size=size)
 
     # Get the user solver preferences
     algorithm, h_function = user_choose_solver()
 
     # Solve the init table
-    puzzle = EightPuzzle(init_state, goal_state)
+    puzzle = EightPuzzle(init_state, EightPuzzle.goal_table(size))
     solution = puzzle.solve(algorithm, h_function)
 
     # Print solution
@@ -81,17 +83,8 @@ def init_seeds(amount):
     :return: list with all the seeds
     """
 
-    seeds = []
-
-    while len(seeds) < amount:
-
-        s = np.random.randint(0, 5000)
-        rnd_table = EightPuzzle.init_table(seed=s)
-
-        if EightPuzzle.is_solvable(rnd_table):
-            seeds.append(s)
-
-    return seeds
+    # Every seed gives a solvable table
+    return np.random.choice(5000, amount, replace=False).tolist()
 
 
 def compare_algorithms(comparisons_amount):
@@ -142,6 +135,23 @@ def compare_algorithms(comparisons_amount):
     print('BnB:\nmanhattan: {}\neuclidean: {}'.format(bnb['manhattan'], bnb['euclidean']))
 
 
+def solve_batch(amount, workers=None):
+    """
+    The function solve many random puzzles in parallel and print the results as they complete
+    :param amount: int, amount of puzzles
+    :param workers: int, number of processes, by default the number of CPUs
+    :return:
+    """
+
+    states = [EightPuzzle.init_table(seed=s) for s in range(amount)]
+
+    start = time()
+    for result in solve_many(states, 'A*', h_manhattan, goal_state, workers=workers, time_limit=10):
+        print(result)
+
+    print('Solved {} puzzles in {:.2f} seconds'.format(amount, time() - start))
+
+
 def results_dataframe(a_star, bnb):
     """
     Reconstruct the results as dataframe
@@ -232,5 +242,8 @@ if __name__ == '__main__':
     # Compare algorithms solving the 8-puzzle
     # compare_algorithms(comparisons_amount=30)
 
+    # Solve many puzzles in parallel
+    # solve_batch(amount=1000)
+
     # Plot comparison figures
     # plot_comparison()
@@ -0,0 +1,67 @@
+import itertools
+import numpy as np
+import pytest
+
+# Backtracking plots its search path with matplotlib
+pytest.importorskip('matplotlib')
+
+from CSP.Backtracking import Backtracking
+
+N_VARIABLES = 5
+N_DOMAIN = 3
+
+MODES = [dict(propagation=propagation, backjumping=backjumping, nogoods=nogoods, variable_ordering=variable_ordering,
+              value_ordering=value_ordering)
+         for propagation in [None, 'FC', 'MAC', 'AC2001']
+         for backjumping in [False, True]
+         for nogoods in [0, 16]
+         for variable_ordering in [None, 'MRV', 'dom/wdeg']
+         for value_ordering in [None, 'LCV']]
+
+
+def random_constraints(seed, n_constraints):
+
+    rng = np.random.default_rng(seed)
+    constraints = set()
+
+    while len(constraints) < n_constraints:
+        x, y = rng.choice(np.arange(1, N_VARIABLES + 1), 2, replace=False)
+        v, w = rng.integers(N_DOMAIN, size=2)
+        constraints.add((int(x), int(v), int(y), int(w)))
+
+    return constraints
+
+
+def is_consistent(values, constraints):
+
+    return not any((x, values[x], y, values[y]) in constraints
+                   for x in values for y in values if x != y)
+
+
+def brute_force(constraints):
+
+    for assignment in itertools.product(range(N_DOMAIN), repeat=N_VARIABLES):
+        if is_consistent(dict(enumerate(assignment, 1)), constraints):
+            return True
+
+    return False
+
+
+INSTANCES = [random_constraints(seed, n_constraints) for seed in range(3) for n_constraints in [15, 25, 35]]
+
+
+@pytest.mark.parametrize('constraints', INSTANCES)
+def test_modes_agree_with_brute_force(constraints):
+
+    solvable = brute_force(constraints)
+
+    for mode in [dict()] + MODES:
+
+        solution = Backtracking(N_VARIABLES, N_DOMAIN, constraints).solve(**mode)
+
+        assert (solution is not None) == solvable, mode
+
+        if solution is not None:
+            values = {variable_id: variable.value for variable_id, variable in solution.items()}
+            assert sorted(values) == list(range(1, N_VARIABLES + 1)), mode
+            assert is_consistent(values, constraints), mode
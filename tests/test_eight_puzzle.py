@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from EightPuzzle.EightPuzzle import EightPuzzle
+from EightPuzzle.DistanceOracle import ORACLE
+from EightPuzzle.sampling import sample_tables
+from EightPuzzle.heuristics import h_manhattan, h_linear_conflict
+
+goal_state = EightPuzzle.goal_table(3)
+init_states = np.concatenate(list(sample_tables(4, size=3, seed=0)))
+
+OPTIMAL = [('A*', {}), ('IDA*', {}), ('BnB', {'search_type': 'dfs'}), ('BnB', {'search_type': 'bfs'}),
+           ('MM', {}), ('ARA*', {}), ('HDA*', {'workers': 2}), ('layered bfs', {}), ('oracle', {})]
+
+BOUNDED = [('WA*', {'weight': 2}), ('ARA*', {'weight': 3}), ('beam', {'beam_width': 20})]
+
+
+def check_solution(solution, init_state):
+
+    assert solution[0].state == init_state.state
+    assert np.array_equal(solution[-1].table, goal_state)
+
+    # Each step slides the blank into one of its neighbours
+    for parent, child in zip(solution, solution[1:]):
+        assert child.blank in parent.board.moves[parent.blank]
+        assert child.state == parent.board.slide(parent.state, parent.blank, child.blank)
+
+
+@pytest.mark.parametrize('algorithm, kwargs', OPTIMAL)
+@pytest.mark.parametrize('index', range(len(init_states)))
+def test_optimal_algorithms_match_the_oracle(algorithm, kwargs, index):
+
+    puzzle = EightPuzzle(init_states[index], goal_state)
+    solution = puzzle.solve(algorithm, h_manhattan, verbose=False, **kwargs)
+
+    check_solution(solution, puzzle.init_state)
+    assert len(solution) - 1 == ORACLE(init_states[index], goal_state)
+    assert puzzle.bound == 1
+
+
+@pytest.mark.parametrize('algorithm, kwargs', BOUNDED)
+@pytest.mark.parametrize('index', range(len(init_states)))
+def test_bounded_algorithms_keep_their_bound(algorithm, kwargs, index):
+
+    puzzle = EightPuzzle(init_states[index], goal_state)
+    solution = puzzle.solve(algorithm, h_linear_conflict, verbose=False, **kwargs)
+
+    check_solution(solution, puzzle.init_state)
+    assert puzzle.bound >= 1
+    assert len(solution) - 1 <= puzzle.bound * ORACLE(init_states[index], goal_state) + 1e-9
+
+    if 'weight' in kwargs:
+        assert puzzle.bound <= kwargs['weight']
+
+
+@pytest.mark.parametrize('algorithm', ['A*', 'WA*', 'ARA*', 'MM', 'IDA*'])
+def test_unsolvable_puzzle_has_no_solution(algorithm):
+
+    init_state = goal_state.copy()
+    init_state[0, 0], init_state[0, 1] = init_state[0, 1], init_state[0, 0]
+
+    assert not EightPuzzle.is_solvable(init_state, goal_state)
+    assert EightPuzzle(init_state, goal_state).solve(algorithm, h_manhattan, verbose=False) is None
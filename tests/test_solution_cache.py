@@ -0,0 +1,24 @@
+import numpy as np
+from EightPuzzle.EightPuzzle import EightPuzzle
+from EightPuzzle.SolutionCache import SolutionCache
+from EightPuzzle.heuristics import h_manhattan
+
+goal_state = EightPuzzle.goal_table(3)
+init_state = np.array([[4, 1, 3],
+                       [7, 2, 6],
+                       [0, 5, 8]])
+
+
+def test_repeated_puzzle_is_a_memory_hit():
+
+    cache = SolutionCache(':memory:', memory_size=3)
+
+    first = EightPuzzle(init_state, goal_state).solve('A*', h_manhattan, verbose=False, cache=cache)
+    second = EightPuzzle(init_state, goal_state).solve('A*', h_manhattan, verbose=False, cache=cache)
+
+    assert [node.state for node in second] == [node.state for node in first]
+    assert cache.memory_hits == 1
+    assert cache.disk_hits == 0
+    assert cache.misses == 1
+
+    cache.close()